@@ -2,10 +2,22 @@
 """
 Database module for Job Scheduler
 Handles SQLite database initialization and operations
+
+Connections are kept per thread (gunicorn request threads, APScheduler job
+threads) and reused: get_connection() hands out the calling thread's
+connection, and close() only releases it. The database runs in WAL mode, so
+dashboard reads never wait for job writes. Connections are in autocommit mode -
+reads hold no transaction, and writes go through transaction(), which takes
+the write lock up front (BEGIN IMMEDIATE) and holds it only for its block.
+Query times, lock waits and write-lock hold times are collected for stats().
 """
 
 import sqlite3
 import os
+import threading
+import time
+import weakref
+from contextlib import contextmanager
 from datetime import datetime
 from werkzeug.security import generate_password_hash
 import logging
@@ -13,14 +25,227 @@ import logging
 logger = logging.getLogger(__name__)
 
 DB_PATH = os.getenv('DB_PATH', 'jobs.db')
+DB_BUSY_TIMEOUT = float(os.getenv('DB_BUSY_TIMEOUT', 10))  # Seconds to wait for another writer's lock
+DB_SLOW_QUERY_MS = float(os.getenv('DB_SLOW_QUERY_MS', 250))  # Log statements (and lock waits) slower than this
+
+# Applied to every new connection (journal_mode=WAL is persistent, the rest per connection)
+PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',  # Durable at checkpoints - safe with WAL, no fsync per commit
+    'PRAGMA cache_size=-8000',  # 8 MB page cache per connection
+    'PRAGMA temp_store=MEMORY'
+)
+
+_local = threading.local()
+_journal_mode = None
+_connections = weakref.WeakSet()
+_connections_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {
+    'connections_opened': 0,
+    'queries': 0,
+    'query_seconds': 0.0,
+    'max_query_seconds': 0.0,
+    'slow_queries': 0,
+    'write_transactions': 0,
+    'lock_wait_seconds': 0.0,
+    'max_lock_wait_seconds': 0.0,
+    'write_hold_seconds': 0.0,
+    'max_write_hold_seconds': 0.0,
+    'busy_errors': 0
+}
+
+def _count_busy(error):
+    """Count 'database is locked' errors (busy timeout exceeded)"""
+    if 'locked' in str(error):
+        with _stats_lock:
+            _stats['busy_errors'] += 1
+
+class TimedCursor(sqlite3.Cursor):
+    """Cursor that records statement times"""
+    
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        except sqlite3.OperationalError as e:
+            _count_busy(e)
+            raise
+        finally:
+            _record_query(sql, time.perf_counter() - started)
+    
+    def executemany(self, sql, seq_of_parameters):
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        except sqlite3.OperationalError as e:
+            _count_busy(e)
+            raise
+        finally:
+            _record_query(sql, time.perf_counter() - started)
+
+def _record_query(sql, seconds):
+    with _stats_lock:
+        _stats['queries'] += 1
+        _stats['query_seconds'] += seconds
+        _stats['max_query_seconds'] = max(_stats['max_query_seconds'], seconds)
+        slow = seconds * 1000 >= DB_SLOW_QUERY_MS
+        if slow:
+            _stats['slow_queries'] += 1
+    if slow:
+        logger.warning(f'Slow query ({seconds * 1000:.0f} ms): {" ".join(sql.split())[:200]}')
 
+class PooledConnection(sqlite3.Connection):
+    """
+    A thread's reusable connection
+    
+    close() releases the connection instead of closing it - an open transaction
+    that isn't managed by transaction() is rolled back, so the next
+    get_connection() in this thread starts clean.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pid = os.getpid()
+        self.thread = threading.current_thread()
+        self.transaction_depth = 0
+    
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+    
+    def execute(self, sql, parameters=()):
+        # sqlite3.Connection.execute bypasses Cursor.execute - route it through the timed cursor
+        return self.cursor().execute(sql, parameters)
+    
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+    
+    def close(self):
+        if self.in_transaction and not self.transaction_depth:
+            self.rollback()
+    
+    def close_connection(self):
+        """Really close the underlying SQLite connection"""
+        super().close()
 
 def get_connection():
-    """Get SQLite database connection"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row  # Enable column access by name
+    """Get this thread's SQLite connection (opened on first use, WAL mode, autocommit)"""
+    conn = getattr(_local, 'conn', None)
+    # A connection inherited through fork() must not be used by the child
+    if conn is None or conn.pid != os.getpid():
+        global _journal_mode
+        _close_abandoned()
+        # check_same_thread off only so _close_abandoned() can close it after this thread ended
+        conn = sqlite3.connect(DB_PATH, timeout=DB_BUSY_TIMEOUT, isolation_level=None, factory=PooledConnection,
+                               check_same_thread=False)
+        conn.row_factory = sqlite3.Row  # Enable column access by name
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        # Stays 'delete' where WAL is unsupported (e.g. network filesystems)
+        _journal_mode = conn.execute('PRAGMA journal_mode').fetchone()[0]
+        _local.conn = conn
+        with _connections_lock:
+            _connections.add(conn)
+        with _stats_lock:
+            _stats['connections_opened'] += 1
     return conn
 
+def close_connection():
+    """Close this thread's connection (e.g. before a thread ends)"""
+    conn = getattr(_local, 'conn', None)
+    if conn is not None:
+        _local.conn = None
+        with _connections_lock:
+            _connections.discard(conn)
+        conn.close_connection()
+
+def _close_abandoned():
+    """Close connections of threads that ended without close_connection() (e.g. a replaced executor's pool)"""
+    with _connections_lock:
+        abandoned = [conn for conn in _connections if conn.pid == os.getpid() and not conn.thread.is_alive()]
+        _connections.difference_update(abandoned)
+    for conn in abandoned:
+        conn.close_connection()
+
+@contextmanager
+def transaction():
+    """
+    Run a write transaction on this thread's connection
+    
+    Takes SQLite's write lock up front (BEGIN IMMEDIATE) - waiting for another
+    writer counts as lock wait - and commits when the block exits, or rolls
+    back on an exception. Keep the block to the writes themselves: no network
+    calls, no password hashing. Nested use joins the outer transaction.
+    
+    Yields:
+        The connection
+    """
+    conn = get_connection()
+    if conn.transaction_depth:
+        conn.transaction_depth += 1
+        try:
+            yield conn
+        finally:
+            conn.transaction_depth -= 1
+        return
+    
+    started = time.perf_counter()
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+    except sqlite3.OperationalError:
+        logger.error(f'Write lock not acquired within {DB_BUSY_TIMEOUT:.0f}s')
+        raise
+    acquired = time.perf_counter()
+    conn.transaction_depth = 1
+    try:
+        yield conn
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
+    else:
+        conn.execute('COMMIT')
+    finally:
+        conn.transaction_depth = 0
+        _record_transaction(acquired - started, time.perf_counter() - acquired)
+
+def _record_transaction(wait, hold):
+    with _stats_lock:
+        _stats['write_transactions'] += 1
+        _stats['lock_wait_seconds'] += wait
+        _stats['max_lock_wait_seconds'] = max(_stats['max_lock_wait_seconds'], wait)
+        _stats['write_hold_seconds'] += hold
+        _stats['max_write_hold_seconds'] = max(_stats['max_write_hold_seconds'], hold)
+    if wait * 1000 >= DB_SLOW_QUERY_MS:
+        logger.warning(f'Waited {wait * 1000:.0f} ms for the database write lock')
+
+def stats():
+    """
+    Return connection, query and lock statistics of this process
+    
+    Returns:
+        Dict with open connections, query counts and average/max times in ms
+    """
+    _close_abandoned()
+    with _stats_lock:
+        s = dict(_stats)
+    queries = s['queries'] or 1
+    writes = s['write_transactions'] or 1
+    return {
+        'journal_mode': _journal_mode,
+        'open_connections': len(_connections),
+        'connections_opened': s['connections_opened'],
+        'queries': s['queries'],
+        'avg_query_ms': round(s['query_seconds'] / queries * 1000, 3),
+        'max_query_ms': round(s['max_query_seconds'] * 1000, 3),
+        'slow_queries': s['slow_queries'],
+        'write_transactions': s['write_transactions'],
+        'avg_lock_wait_ms': round(s['lock_wait_seconds'] / writes * 1000, 3),
+        'max_lock_wait_ms': round(s['max_lock_wait_seconds'] * 1000, 3),
+        'avg_write_hold_ms': round(s['write_hold_seconds'] / writes * 1000, 3),
+        'max_write_hold_ms': round(s['max_write_hold_seconds'] * 1000, 3),
+        'busy_errors': s['busy_errors']
+    }
+
 # Keys whose values should always be stored as a base URL ending with '/'
 URL_KEYS = {'scraper_api_url', 'matterbridge_url', 'apprise_api_url'}
 
@@ -28,73 +253,100 @@ def normalize_url(value):
     """Ensure a URL ends with exactly one trailing slash."""
     return value.rstrip('/') + '/' if value else ''
 
+def config_generation():
+    """Return the current global_config generation"""
+    return get_connection().execute('SELECT generation FROM config_generation').fetchone()[0]
+
+def bump_config_generation(conn):
+    """Increment the global_config generation - call inside the transaction that writes the config"""
+    conn.execute('UPDATE config_generation SET generation = generation + 1')
+
 
 def init_database():
     """Initialize database schema"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # Users table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT NOT NULL UNIQUE,
-            password_hash TEXT NOT NULL,
-            email TEXT,
-            is_active BOOLEAN DEFAULT 1,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            last_login TIMESTAMP
-        )
-    ''')
-    
-    # Jobs table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS jobs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL UNIQUE,
-            url TEXT NOT NULL,
-            schedule TEXT NOT NULL,
-            enabled BOOLEAN DEFAULT 1,
-            
-            -- Notification settings (Matterbridge integration)
-            notify_enabled BOOLEAN DEFAULT 0,
-            priority BOOLEAN DEFAULT 0,
-            
-            -- Status
-            last_run TIMESTAMP,
-            last_status TEXT,
-            last_listing_id TEXT,
-            
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # Global config table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS global_config (
-            key TEXT PRIMARY KEY,
-            value TEXT NOT NULL,
-            description TEXT,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    conn.commit()
-
-    # Create default admin user if none exists
-    cursor.execute('SELECT COUNT(*) FROM users')
-    if cursor.fetchone()[0] == 0:
+    with transaction() as conn:
+        # Users table
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT NOT NULL UNIQUE,
+                password_hash TEXT NOT NULL,
+                email TEXT,
+                is_active BOOLEAN DEFAULT 1,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                last_login TIMESTAMP
+            )
+        ''')
+        
+        # Jobs table
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL UNIQUE,
+                url TEXT NOT NULL,
+                schedule TEXT NOT NULL,
+                enabled BOOLEAN DEFAULT 1,
+                
+                -- Notification settings (Matterbridge integration)
+                notify_enabled BOOLEAN DEFAULT 0,
+                priority BOOLEAN DEFAULT 0,
+                
+                -- Status
+                last_run TIMESTAMP,
+                last_status TEXT,
+                last_listing_id TEXT,
+                
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Global config table
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS global_config (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                description TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Config generation - incremented with every global_config write, so
+        # other worker processes notice that their cached config is stale
+        conn.execute('CREATE TABLE IF NOT EXISTS config_generation (generation INTEGER NOT NULL)')
+        conn.execute('INSERT INTO config_generation SELECT 0 WHERE NOT EXISTS (SELECT 1 FROM config_generation)')
+        
+        # Notification outbox - one message per listing and channel, written in
+        # the transaction that records the job run, sent by the delivery workers.
+        # Times are wall-clock (Unix seconds), comparable between worker processes.
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS notification_outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id INTEGER,
+                channel TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                created_at REAL NOT NULL,
+                next_attempt_at REAL NOT NULL,
+                claimed_at REAL,
+                sent_at REAL
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS notification_outbox_due ON notification_outbox (channel, status, next_attempt_at)')
+    
+    # Create default admin user if none exists (hash outside the write lock)
+    if conn.execute('SELECT COUNT(*) FROM users').fetchone()[0] == 0:
         admin_username = os.getenv('ADMIN_USERNAME', 'admin')
         admin_password = os.getenv('ADMIN_PASSWORD', 'admin')
         password_hash = generate_password_hash(admin_password)
         
-        cursor.execute('''
-            INSERT INTO users (username, password_hash, email)
-            VALUES (?, ?, ?)
-        ''', (admin_username, password_hash, 'admin@localhost'))
-        
-        conn.commit()
+        with transaction() as conn:
+            conn.execute('''
+                INSERT OR IGNORE INTO users (username, password_hash, email)
+                VALUES (?, ?, ?)
+            ''', (admin_username, password_hash, 'admin@localhost'))
         
         # Determine password source for logging (never log the actual password!)
         password_source = 'ADMIN_PASSWORD environment variable' if os.getenv('ADMIN_PASSWORD') else 'default value (INSECURE!)'
@@ -181,16 +433,52 @@ def init_database():
         'apprise_password': {
             'value': os.getenv('APPRISE_PASSWORD', ''),
             'description': 'Optional: HTTP Basic Auth password (only if Apprise is behind a reverse proxy with auth)'
+        },
+        
+        # Job Execution
+        'executor_pool_size': {
+            'value': os.getenv('EXECUTOR_POOL_SIZE', '10'),
+            'description': 'Number of threads running jobs'
+        },
+        'job_max_instances': {
+            'value': os.getenv('JOB_MAX_INSTANCES', '1'),
+            'description': 'Maximum concurrent runs of the same job - further runs are skipped while it is still running'
+        },
+        'job_coalesce': {
+            'value': os.getenv('JOB_COALESCE', 'true'),
+            'description': 'Run a job once instead of once per missed run after a stall'
+        },
+        'job_misfire_grace_time': {
+            'value': os.getenv('JOB_MISFIRE_GRACE_TIME', '60'),
+            'description': 'Seconds a run may start late before it is skipped as missed'
+        },
+        'max_concurrent_scrapes': {
+            'value': os.getenv('MAX_CONCURRENT_SCRAPES', '4'),
+            'description': 'Maximum Scraper API calls in flight across all jobs - further jobs wait for a slot'
+        },
+        
+        # Notification Delivery
+        'notification_concurrency': {
+            'value': os.getenv('NOTIFICATION_CONCURRENCY', '2'),
+            'description': 'Delivery workers per notification channel (Matterbridge, Apprise)'
+        },
+        'notification_max_attempts': {
+            'value': os.getenv('NOTIFICATION_MAX_ATTEMPTS', '8'),
+            'description': 'Attempts per notification before it is marked as failed'
+        },
+        'notification_retry_delay': {
+            'value': os.getenv('NOTIFICATION_RETRY_DELAY', '30'),
+            'description': 'Seconds before the first retry of a failed notification - doubled with every further attempt'
         }
     }
     
-    for key, config in default_configs.items():
-        cursor.execute('''
+    with transaction() as conn:
+        inserted = conn.executemany('''
             INSERT OR IGNORE INTO global_config (key, value, description)
             VALUES (?, ?, ?)
-        ''', (key, config['value'], config['description']))
-    
-    conn.commit()
+        ''', [(key, config['value'], config['description']) for key, config in default_configs.items()]).rowcount
+        if inserted > 0:
+            bump_config_generation(conn)
     conn.close()
     
     logger.info('Database initialized successfully')
@@ -9,6 +9,9 @@ from flask_cors import CORS
 from werkzeug.security import check_password_hash
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.jobstores.base import JobLookupError
+from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.events import EVENT_JOB_SUBMITTED, EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED
 from datetime import datetime, timedelta
 from cryptography.fernet import Fernet
 import requests
@@ -17,8 +20,12 @@ import os
 import logging
 import sys
 import json
+import threading
+import time
 import jwt
 import base64
+from collections import Counter, deque
+from contextlib import contextmanager
 from functools import wraps
 from flask_swagger_ui import get_swaggerui_blueprint
 
@@ -54,6 +61,12 @@ VERSION = '1.0.0'
 ENABLE_SWAGGER_UI = os.getenv('ENABLE_SWAGGER_UI', 'true').lower() in ('true', '1', 'yes')
 ENABLE_WEB_UI = os.getenv('ENABLE_WEB_UI', 'true').lower() in ('true', '1', 'yes')
 
+# Config cache: seconds between checks for config changes made by other worker processes (0 = every read)
+CONFIG_CHECK_INTERVAL = float(os.getenv('CONFIG_CHECK_INTERVAL', 5))
+
+# Notification outbox: days sent and failed notifications are kept before they are deleted
+NOTIFICATION_RETENTION_DAYS = float(os.getenv('NOTIFICATION_RETENTION_DAYS', 7))
+
 logger.info(f'Logging initialized at {log_level_name} level')
 logger.info(f'{"✓" if ENABLE_WEB_UI else "✗"} Web UI {"enabled" if ENABLE_WEB_UI else "disabled"}')
 
@@ -112,7 +125,9 @@ else:
 # APScheduler Setup
 # ============================================================================
 
-scheduler = BackgroundScheduler(daemon=True)
+# Pool size and job defaults come from global_config (apply_execution_settings, before jobs are loaded)
+job_executor = ThreadPoolExecutor(10)
+scheduler = BackgroundScheduler(daemon=True, executors={'default': job_executor})
 logger.info('Starting APScheduler...')
 scheduler.start()
 logger.info('✓ APScheduler started')
@@ -149,6 +164,93 @@ def decrypt_value(encrypted_value):
     except Exception:
         return encrypted_value
 
+# ============================================================================
+# Config Cache
+# ============================================================================
+
+class ConfigCache:
+    """
+    Decrypted, normalized in-memory snapshot of global_config
+    
+    get() answers from the snapshot without touching the database. Every
+    config write increments a generation counter in the database (in the same
+    transaction); at most every check_interval seconds the cache compares it
+    with the generation of its snapshot and reloads on a change - that is how
+    writes from other worker processes arrive. Writes in this process call
+    reload() directly. Snapshots are replaced as a whole, so readers never see
+    a half-updated config.
+    
+    Args:
+        check_interval: Seconds between generation checks (0 = check on every read)
+    """
+    
+    def __init__(self, check_interval):
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._snapshot = {}
+        self._generation = None
+        self._loaded_at = None
+        self._checked_at = float('-inf')
+        self.reloads = 0
+        self.checks = 0
+    
+    def get(self, key, default=None):
+        """Return a config value (decrypted, URL keys normalized) or default if the key is missing"""
+        if time.monotonic() - self._checked_at >= self.check_interval:
+            self._check()
+        return self._snapshot.get(key, default)
+    
+    def _check(self):
+        """Reload the snapshot if another process changed the config"""
+        with self._lock:
+            if time.monotonic() - self._checked_at < self.check_interval:
+                return  # Another thread just checked
+            self.checks += 1
+            generation = database.config_generation()
+            if generation != self._generation:
+                self._load(generation)
+            self._checked_at = time.monotonic()
+    
+    def reload(self):
+        """Reload the snapshot now (after a config write in this process)"""
+        with self._lock:
+            self._load(database.config_generation())
+            self._checked_at = time.monotonic()
+    
+    def _load(self, generation):
+        # Generation is read before the rows: a write in between only causes one extra reload
+        conn = database.get_connection()
+        rows = conn.execute('SELECT key, value FROM global_config').fetchall()
+        conn.close()
+        
+        snapshot = {}
+        for row in rows:
+            key, value = row['key'], row['value']
+            if key in SENSITIVE_KEYS:
+                value = decrypt_value(value)
+            elif key in database.URL_KEYS:
+                value = database.normalize_url(value)
+            snapshot[key] = value
+        
+        self._snapshot = snapshot
+        self._generation = generation
+        self._loaded_at = time.time()
+        self.reloads += 1
+        logger.debug(f'Config cache loaded generation {generation} ({len(snapshot)} keys)')
+    
+    def stats(self):
+        """Return generation, reload and check counts and the snapshot's age"""
+        return {
+            'generation': self._generation,
+            'keys': len(self._snapshot),
+            'reloads': self.reloads,
+            'checks': self.checks,
+            'check_interval_seconds': self.check_interval,
+            'age_seconds': round(time.time() - self._loaded_at, 1) if self._loaded_at else None
+        }
+
+config_cache = ConfigCache(CONFIG_CHECK_INTERVAL)
+
 # ============================================================================
 # JWT Helper Functions
 # ============================================================================
@@ -213,48 +315,60 @@ def require_token(f):
 # ============================================================================
 
 def get_config(key, default=None):
-    """Get configuration value from database (decrypts sensitive values).
+    """Get configuration value from the config cache (decrypts sensitive values).
     URL keys are always returned normalized (trailing slash guaranteed).
     """
-    conn = database.get_connection()
-    cursor = conn.cursor()
-    cursor.execute('SELECT value FROM global_config WHERE key = ?', (key,))
-    row = cursor.fetchone()
-    conn.close()
-    
-    if not row:
-        return default
-    
-    value = row['value']
-    
-    if key in SENSITIVE_KEYS:
-        return decrypt_value(value)
-    
-    if key in database.URL_KEYS:
-        return database.normalize_url(value)
-    
-    return value
+    return config_cache.get(key, default)
 
 def call_scraper_api_scrape(url, since=None):
-    """Call Scraper API - get all or new listings"""
+    """Call Scraper API - get all or new listings
+    
+    Requests the NDJSON stream, so the read timeout applies between events
+    (the scraper sends heartbeats) instead of to the whole multi-page scrape.
+    Returns the same shape as the buffered JSON response, listings newest first.
+    """
     scraper_url = get_config('scraper_api_url', 'http://scraper:3000/')
     scraper_api_key = get_config('scraper_api_key', 'test-key-123')
     timeout = int(get_config('scraper_request_timeout', '30'))
     
-    params = {'url': url}
+    params = {'url': url, 'format': 'ndjson'}
     if since:
         params['since'] = since
     
     headers = {'X-API-Key': scraper_api_key}
     
-    response = requests.get(
+    with scrape_gate.slot(), requests.get(
         f'{scraper_url}api/scrape',
         params=params,
         headers=headers,
-        timeout=timeout
-    )
-    response.raise_for_status()
-    return response.json()
+        timeout=timeout,
+        stream=True
+    ) as response:
+        response.raise_for_status()
+        
+        # Older scraper versions ignore 'format' and answer with one JSON document
+        if not response.headers.get('Content-Type', '').startswith('application/x-ndjson'):
+            return response.json()
+        
+        listings = {}
+        summary = None
+        for line in response.iter_lines():
+            if not line:
+                continue
+            event = json.loads(line)
+            if event['type'] == 'listing':
+                listings[event['listing']['id']] = event['listing']
+            elif event['type'] == 'summary':
+                summary = event
+    
+    if summary is None:
+        raise requests.RequestException('Scraper API stream ended without summary')
+    if not summary.get('success'):
+        raise requests.RequestException(summary.get('error', 'Scraper API stream failed'))
+    
+    result = {k: v for k, v in summary.items() if k not in ('type', 'order')}
+    result['listings'] = [listings[listing_id] for listing_id in summary['order'] if listing_id in listings]
+    return result
 
 def call_scraper_api_newest(url):
     """Call Scraper API - get only newest non-promoted listing"""
@@ -265,31 +379,37 @@ def call_scraper_api_newest(url):
     params = {'url': url}
     headers = {'X-API-Key': scraper_api_key}
     
-    response = requests.get(
-        f'{scraper_url}api/newest',
-        params=params,
-        headers=headers,
-        timeout=timeout
-    )
+    with scrape_gate.slot():
+        response = requests.get(
+            f'{scraper_url}api/newest',
+            params=params,
+            headers=headers,
+            timeout=timeout
+        )
     response.raise_for_status()
     return response.json()
 
-def send_apprise_notification(job_data, listings):
-    """Send notification via Apprise API container"""
-    if not job_data.get('notify_enabled'):
-        return False
+class ChannelUnavailable(Exception):
+    """A notification channel was disabled or unconfigured after messages were queued for it"""
 
+def build_apprise_messages(job_data, listings):
+    """
+    Render one Apprise message per listing
+    
+    Returns:
+        List of POST /notify payloads (empty if Apprise is not enabled or not configured)
+    """
     apprise_url = get_config('apprise_api_url', '')
     apprise_key = get_config('apprise_api_key', '')
     language = get_config('notification_language', 'de')
 
     if get_config('apprise_enabled', 'false') != 'true':
         logger.debug('Apprise not enabled, skipping')
-        return False
+        return []
 
     if not apprise_url or not apprise_key:
         logger.debug('Apprise not configured, skipping')
-        return False
+        return []
 
     translations = {
         'de': {
@@ -303,11 +423,10 @@ def send_apprise_notification(job_data, listings):
     }
     t = translations.get(language, translations['de'])
 
-    success_count = 0
-
     is_priority = job_data.get('priority', False)
     priority_tag = ' @everyone' if is_priority else ''
 
+    messages = []
     for idx, listing in enumerate(listings, 1):
         title = f"🔔 {job_data['name']} – {t['new_listing']} {idx}/{len(listings)}{priority_tag}"
 
@@ -335,66 +454,58 @@ def send_apprise_notification(job_data, listings):
         if listing.get('image'):
             body_parts.append(f"🖼️ {listing['image']}")
 
-        body = '\n'.join(body_parts)
-
-        try:
-            payload = {
-                'title': title,
-                'body': body,
-            }
+        messages.append({
+            'title': title,
+            'body': '\n'.join(body_parts),
+        })
 
-            headers = {'Content-Type': 'application/json'}
+    return messages
 
-            # Add HTTP Basic Auth if configured (e.g. when behind a reverse proxy)
-            apprise_username = get_config('apprise_username', '')
-            apprise_password_val = get_config('apprise_password', '')
-            if apprise_username and apprise_password_val:
-                import base64
-                credentials = base64.b64encode(f'{apprise_username}:{apprise_password_val}'.encode()).decode()
-                headers['Authorization'] = f'Basic {credentials}'
-                logger.debug('Apprise: using HTTP Basic Auth')
+def deliver_apprise(payload):
+    """Send one queued message to the Apprise API (raises on failure)"""
+    apprise_url = get_config('apprise_api_url', '')
+    apprise_key = get_config('apprise_api_key', '')
 
-            logger.debug(f'Sending listing {idx}/{len(listings)} to Apprise (key: {apprise_key})')
+    if get_config('apprise_enabled', 'false') != 'true' or not apprise_url or not apprise_key:
+        raise ChannelUnavailable('Apprise is not enabled or not configured')
 
-            response = requests.post(
-                f'{apprise_url}notify/{apprise_key}',
-                json=payload,
-                headers=headers,
-                timeout=10
-            )
+    headers = {'Content-Type': 'application/json'}
 
-            response.raise_for_status()
-            success_count += 1
-            logger.info(f'✅ Apprise: listing {idx}/{len(listings)} sent successfully')
+    # Add HTTP Basic Auth if configured (e.g. when behind a reverse proxy)
+    apprise_username = get_config('apprise_username', '')
+    apprise_password_val = get_config('apprise_password', '')
+    if apprise_username and apprise_password_val:
+        credentials = base64.b64encode(f'{apprise_username}:{apprise_password_val}'.encode()).decode()
+        headers['Authorization'] = f'Basic {credentials}'
 
-        except Exception as e:
-            logger.error(f'❌ Apprise: failed to send listing {idx}/{len(listings)}: {e}')
+    logger.debug(f'Sending "{payload["title"]}" to Apprise (key: {apprise_key})')
 
-    if success_count > 0:
-        logger.info(f'✅ Apprise: sent {success_count}/{len(listings)} listings via key "{apprise_key}"')
-        return True
-    else:
-        logger.error('❌ Apprise: failed to send any listings')
-        return False
+    response = requests.post(
+        f'{apprise_url}notify/{apprise_key}',
+        json=payload,
+        headers=headers,
+        timeout=10
+    )
+    response.raise_for_status()
 
-def send_notification(job_data, listings):
-    """Send notification via Matterbridge"""
-    if not job_data.get('notify_enabled'):
-        return False
+def build_matterbridge_messages(job_data, listings):
+    """
+    Render one Matterbridge message per listing
     
-    matterbridge_url = get_config('matterbridge_url', 'http://matterbridge:4242/')
-    matterbridge_token = get_config('matterbridge_token', '')
+    Returns:
+        List of POST /api/message payloads (empty if Matterbridge is not enabled or has no token)
+    """
     gateway = get_config('matterbridge_gateway', 'gateway_ebaykleinanzeigen')
     username = get_config('matterbridge_username', 'Kleinanzeigen Bot')
     language = get_config('notification_language', 'de')
     
     if get_config('matterbridge_enabled', 'false') != 'true':
         logger.debug('Matterbridge not enabled, skipping')
-        return False
+        return []
 
-    if not matterbridge_token:
+    if not get_config('matterbridge_token', ''):
         logger.warning('Matterbridge token not configured, skipping notification')
-        return False
+        return []
     
     translations = {
         'de': {
@@ -431,16 +542,10 @@ def send_notification(job_data, listings):
     
     t = translations.get(language, translations['de'])
     
-    headers = {
-        'Content-Type': 'application/json',
-        'Authorization': f'Bearer {matterbridge_token}'
-    }
-    
-    success_count = 0
-    
     is_priority = job_data.get('priority', False)
     priority_tag = ' @everyone' if is_priority else ''
 
+    messages = []
     for idx, listing in enumerate(listings, 1):
         message_parts = []
         message_parts.append(f"🔔 **{job_data['name']}** - {t['new_listing']} {idx}/{len(listings)}{priority_tag}")
@@ -490,50 +595,81 @@ def send_notification(job_data, listings):
         message_parts.append("")
         message_parts.append("─" * 40)
         
-        message = '\n'.join(message_parts)
-        
-        try:
-            payload = {
-                'text': message,
-                'username': username,
-                'gateway': gateway
-            }
-            
-            logger.debug(f'Sending listing {idx}/{len(listings)} to Matterbridge')
-            logger.debug(f'Payload: {json.dumps(payload, indent=2)}')
-            
-            response = requests.post(
-                f'{matterbridge_url}api/message',
-                json=payload,
-                headers=headers,
-                timeout=10
-            )
-            
-            response.raise_for_status()
-            success_count += 1
-            logger.info(f'✅ Listing {idx}/{len(listings)} sent successfully')
-            
-        except Exception as e:
-            logger.error(f'❌ Failed to send listing {idx}/{len(listings)}: {e}')
+        messages.append({
+            'text': '\n'.join(message_parts),
+            'username': username,
+            'gateway': gateway
+        })
     
-    if success_count > 0:
-        logger.info(f'✅ Sent {success_count}/{len(listings)} listings to Matterbridge gateway "{gateway}"')
-        return True
-    else:
-        logger.error(f'❌ Failed to send any listings to Matterbridge')
-        return False
+    return messages
+
+def deliver_matterbridge(payload):
+    """Send one queued message to Matterbridge (raises on failure)"""
+    matterbridge_url = get_config('matterbridge_url', 'http://matterbridge:4242/')
+    matterbridge_token = get_config('matterbridge_token', '')
+    
+    if get_config('matterbridge_enabled', 'false') != 'true' or not matterbridge_token:
+        raise ChannelUnavailable('Matterbridge is not enabled or has no token')
+    
+    headers = {
+        'Content-Type': 'application/json',
+        'Authorization': f'Bearer {matterbridge_token}'
+    }
+    
+    logger.debug(f'Payload: {json.dumps(payload, indent=2)}')
+    
+    response = requests.post(
+        f'{matterbridge_url}api/message',
+        json=payload,
+        headers=headers,
+        timeout=10
+    )
+    response.raise_for_status()
+
+def notification_messages(job_data, listings):
+    """Return (channel, payload) for every enabled channel and listing"""
+    return ([('matterbridge', payload) for payload in build_matterbridge_messages(job_data, listings)] +
+            [('apprise', payload) for payload in build_apprise_messages(job_data, listings)])
 
 def execute_job(job_id):
-    """Execute a scheduled job"""
+    """Execute a scheduled job - skipped while job_max_instances runs of it are in progress"""
+    with _execution_lock:
+        _execution_counts['started'] += 1
+        overlap = _running_jobs[job_id] >= _execution['max_instances']
+        if overlap:
+            _execution_counts['skipped_overlaps'] += 1
+        else:
+            _running_jobs[job_id] += 1
+    
+    if overlap:
+        logger.warning(f'Job {job_id} is still running - skipping this run')
+        return
+    
+    try:
+        _run_job(job_id)
+    finally:
+        with _execution_lock:
+            _running_jobs[job_id] -= 1
+            if not _running_jobs[job_id]:
+                del _running_jobs[job_id]
+
+def _run_job(job_id):
+    """Run a job: scrape, update its status, queue notifications
+    
+    No database transaction is held while the Scraper API is called - the job
+    is read up front and its status written in a short transaction at the end.
+    Notifications for the new listings are queued in that same transaction, so
+    last_listing_id never moves past listings whose notifications were lost.
+    """
     conn = database.get_connection()
     cursor = conn.cursor()
     
     cursor.execute('SELECT * FROM jobs WHERE id = ? AND enabled = 1', (job_id,))
     job = cursor.fetchone()
+    conn.close()
     
     if not job:
         logger.warning(f'Job {job_id} not found or disabled')
-        conn.close()
         return
     
     job_dict = dict(job)
@@ -618,19 +754,22 @@ def execute_job(job_id):
         logger.debug(f'   Status: success')
         logger.debug(f'   Last listing ID: {newest_listing_id}')
         
-        cursor.execute('''
-            UPDATE jobs 
-            SET last_run = ?, last_status = ?, last_listing_id = ?, updated_at = ?
-            WHERE id = ?
-        ''', (started_at, 'success', newest_listing_id, datetime.now(), job_id))
+        messages = []
+        if job_dict.get('notify_enabled') and new_count > 0:
+            messages = notification_messages(job_dict, listings)
         
-        conn.commit()
+        with database.transaction() as conn:
+            conn.execute('''
+                UPDATE jobs 
+                SET last_run = ?, last_status = ?, last_listing_id = ?, updated_at = ?
+                WHERE id = ?
+            ''', (started_at, 'success', newest_listing_id, datetime.now(), job_id))
+            outbox.enqueue(conn, job_id, messages)
         logger.debug(f'✅ Database updated successfully')
         
-        if job_dict.get('notify_enabled') and new_count > 0:
-            logger.info(f'📢 SENDING NOTIFICATIONS')
-            send_notification(job_dict, listings)
-            send_apprise_notification(job_dict, listings)
+        if messages:
+            logger.info(f'📢 QUEUED {len(messages)} NOTIFICATION(S)')
+            outbox.wake()
         
         logger.info('=' * 80)
         logger.info(f'✅ JOB COMPLETED SUCCESSFULLY: {job_dict["name"]}')
@@ -653,48 +792,546 @@ def execute_job(job_id):
                 logger.error(f'   {line}')
         logger.error('=' * 80)
         
-        cursor.execute('''
-            UPDATE jobs 
-            SET last_run = ?, last_status = ?, updated_at = ?
-            WHERE id = ?
-        ''', (started_at, 'failed', datetime.now(), job_id))
-        
-        conn.commit()
+        with database.transaction() as conn:
+            conn.execute('''
+                UPDATE jobs 
+                SET last_run = ?, last_status = ?, updated_at = ?
+                WHERE id = ?
+            ''', (started_at, 'failed', datetime.now(), job_id))
+
+# ============================================================================
+# Execution Controls
+# ============================================================================
+
+class ScrapeGate:
+    """
+    Resizable cap on Scraper API calls in flight across all job threads
     
-    finally:
-        conn.close()
+    Jobs beyond the limit wait for a slot, so a burst of due jobs (e.g. after a
+    stall) reaches the scraper a few at a time.
+    
+    Args:
+        limit: Maximum concurrent Scraper API calls
+    """
+    
+    def __init__(self, limit):
+        self.limit = limit
+        self._condition = threading.Condition()
+        self.in_flight = 0
+        self.waiting = 0
+        self.calls = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+    
+    def resize(self, limit):
+        """Change the limit - waiting calls start at once if it grew"""
+        with self._condition:
+            self.limit = limit
+            self._condition.notify_all()
+    
+    @contextmanager
+    def slot(self):
+        """Hold one slot for the duration of a Scraper API call"""
+        started = time.monotonic()
+        with self._condition:
+            self.waiting += 1
+            try:
+                while self.in_flight >= self.limit:
+                    self._condition.wait()
+            finally:
+                self.waiting -= 1
+            self.in_flight += 1
+            waited = time.monotonic() - started
+            self.calls += 1
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        try:
+            yield
+        finally:
+            with self._condition:
+                self.in_flight -= 1
+                self._condition.notify()
+
+scrape_gate = ScrapeGate(4)
+
+# Settings currently applied - the startup executor's until apply_execution_settings()
+_execution = {'pool_size': 10, 'max_instances': 1}
+_execution_lock = threading.Lock()
+_running_jobs = Counter()  # job id -> runs in progress
+# Submitted and started are totals - the submission event can arrive after the run started
+_execution_counts = {'submitted': 0, 'started': 0, 'skipped_overlaps': 0, 'missed_runs': 0}
+
+def _positive_int_config(key, default):
+    value = get_config(key, str(default))
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        logger.warning(f'Invalid {key} "{value}", using {default}')
+        return default
+
+def execution_settings():
+    """Read the job execution controls from global_config (invalid values fall back to the defaults)"""
+    return {
+        'pool_size': _positive_int_config('executor_pool_size', 10),
+        'max_instances': _positive_int_config('job_max_instances', 1),
+        'coalesce': get_config('job_coalesce', 'true') == 'true',
+        'misfire_grace_time': _positive_int_config('job_misfire_grace_time', 60),
+        'max_concurrent_scrapes': _positive_int_config('max_concurrent_scrapes', 4)
+    }
 
-def reload_scheduler():
-    """Reload all jobs into the scheduler"""
-    scheduler.remove_all_jobs()
+def job_options():
+    """APScheduler options for job entries, from the applied execution settings"""
+    return {
+        'max_instances': _execution['max_instances'],
+        'coalesce': _execution['coalesce'],
+        'misfire_grace_time': _execution['misfire_grace_time']
+    }
+
+def apply_execution_settings():
+    """
+    Apply changed execution controls to the executor, the scrape gate and all scheduled jobs
     
-    conn = database.get_connection()
-    cursor = conn.cursor()
-    cursor.execute('SELECT * FROM jobs WHERE enabled = 1')
-    jobs = cursor.fetchall()
-    conn.close()
+    A new pool size replaces the executor - runs in progress finish on the old one.
+    """
+    global _execution, job_executor
+    settings = execution_settings()
+    if settings == _execution:
+        return
+    previous, _execution = _execution, settings
+    
+    if settings['pool_size'] != previous['pool_size']:
+        old_executor, job_executor = job_executor, ThreadPoolExecutor(settings['pool_size'])
+        scheduler.remove_executor('default', shutdown=False)
+        scheduler.add_executor(job_executor, 'default')
+        old_executor.shutdown(wait=False)
+    
+    scrape_gate.resize(settings['max_concurrent_scrapes'])
+    
+    options = job_options()
+    if any(options[key] != previous.get(key) for key in options):
+        with _reconcile_lock:
+            for job_id in _scheduled:
+                scheduler.modify_job(f'job_{job_id}', **options)
+    
+    logger.info(f'Execution settings: {settings["pool_size"]} threads, max {settings["max_instances"]} instance(s) per job, '
+                f'coalesce {settings["coalesce"]}, misfire grace {settings["misfire_grace_time"]}s, '
+                f'max {settings["max_concurrent_scrapes"]} concurrent scrapes')
+
+def _on_job_event(event):
+    """Count submissions (queue depth), runs skipped by max_instances and missed runs"""
+    with _execution_lock:
+        if event.code == EVENT_JOB_SUBMITTED:
+            _execution_counts['submitted'] += 1
+        elif event.code == EVENT_JOB_MAX_INSTANCES:
+            _execution_counts['skipped_overlaps'] += 1
+        elif event.code == EVENT_JOB_MISSED:
+            _execution_counts['missed_runs'] += 1
+
+scheduler.add_listener(_on_job_event, EVENT_JOB_SUBMITTED | EVENT_JOB_MAX_INSTANCES | EVENT_JOB_MISSED)
+
+def execution_stats():
+    """
+    Return the applied execution settings and live queue state
     
-    for job in jobs:
+    Returns:
+        Dict with the settings, runs queued for a thread, running and waiting
+        for a scraper slot, and counts of skipped and missed runs
+    """
+    with _execution_lock:
+        counts = dict(_execution_counts)
+        running = sum(_running_jobs.values())
+    calls = scrape_gate.calls or 1
+    return {
+        **_execution,
+        'scheduled_jobs': len(_scheduled),
+        'queued': max(0, counts['submitted'] - counts['started']),
+        'running': running,
+        'waiting_for_scraper': scrape_gate.waiting,
+        'scrapes_in_flight': scrape_gate.in_flight,
+        'skipped_overlaps': counts['skipped_overlaps'],
+        'missed_runs': counts['missed_runs'],
+        'avg_scraper_wait_ms': round(scrape_gate.wait_seconds / calls * 1000, 1),
+        'max_scraper_wait_ms': round(scrape_gate.max_wait_seconds * 1000, 1)
+    }
+
+# ============================================================================
+# Notification Outbox
+# ============================================================================
+
+class NotificationOutbox:
+    """
+    Delivery workers for the notification_outbox table
+    
+    Jobs only queue their messages (enqueue, inside the job's status
+    transaction); sending happens here. Every channel has its own workers
+    (notification_concurrency), so a slow or failing channel does not hold up
+    the other. A worker claims the oldest due message of its channel, sends it
+    and marks it sent - or schedules a retry with exponential backoff until
+    notification_max_attempts is reached and the message is marked failed.
+    
+    A claim is a conditional UPDATE (pending -> sending), so workers of several
+    gunicorn processes never send the same message twice. Messages left in
+    'sending' by a process that died are released after CLAIM_TIMEOUT.
+    """
+    
+    CLAIM_TIMEOUT = 300  # Seconds - far beyond the 10 s request timeout
+    POLL_INTERVAL = 5  # Longest wait of an idle worker - messages queued by other processes are found this late
+    MAINTENANCE_INTERVAL = 60
+    MAX_RETRY_DELAY = 3600
+    
+    def __init__(self, senders):
+        self.senders = senders
+        self.concurrency = 0
+        self._condition = threading.Condition()
+        self._workers = {}  # (channel, index) -> thread
+        self._maintainer = None
+        self._lock = threading.Lock()
+        self._counts = {channel: Counter() for channel in senders}
+        self._lags = {channel: deque(maxlen=100) for channel in senders}  # Seconds from queued to sent
+    
+    def enqueue(self, conn, job_id, messages):
+        """
+        Queue messages - call inside the transaction that records the job run
+        
+        Args:
+            conn: Connection of the open transaction
+            job_id: Job the messages belong to
+            messages: List of (channel, payload)
+        """
+        if not messages:
+            return
+        now = time.time()
+        conn.executemany('''
+            INSERT INTO notification_outbox (job_id, channel, payload, created_at, next_attempt_at)
+            VALUES (?, ?, ?, ?, ?)
+        ''', [(job_id, channel, json.dumps(payload, ensure_ascii=False), now, now) for channel, payload in messages])
+    
+    def wake(self):
+        """Let idle workers pick up newly queued messages at once"""
+        with self._condition:
+            self._condition.notify_all()
+    
+    def apply_settings(self):
+        """Start or stop workers to match notification_concurrency"""
+        concurrency = _positive_int_config('notification_concurrency', 2)
+        with self._condition:
+            if concurrency != self.concurrency:
+                logger.info(f'Notification delivery: {concurrency} worker(s) per channel')
+            self.concurrency = concurrency
+            for channel in self.senders:
+                for index in range(concurrency):
+                    thread = self._workers.get((channel, index))
+                    if thread is None or not thread.is_alive():
+                        thread = threading.Thread(target=self._work, args=(channel, index),
+                                                  name=f'notify-{channel}-{index}', daemon=True)
+                        self._workers[(channel, index)] = thread
+                        thread.start()
+            if self._maintainer is None or not self._maintainer.is_alive():
+                self._maintainer = threading.Thread(target=self._maintain, name='notify-maintenance', daemon=True)
+                self._maintainer.start()
+            # Workers beyond the new count exit once woken
+            self._condition.notify_all()
+    
+    def _work(self, channel, index):
+        while index < self.concurrency:
+            try:
+                message = self._claim(channel)
+            except Exception as e:
+                logger.error(f'Notification outbox ({channel}): claiming a message failed: {e}')
+                message = None
+            
+            if message is None:
+                with self._condition:
+                    self._condition.wait(self._idle_seconds(channel))
+                continue
+            try:
+                self._deliver(channel, message)
+            except Exception as e:
+                # Outcome not recorded - the claim is released after CLAIM_TIMEOUT and the message sent again
+                logger.error(f'Notification outbox ({channel}): recording message {message["id"]} failed: {e}')
+        
+        with self._condition:
+            if self._workers.get((channel, index)) is threading.current_thread():
+                del self._workers[(channel, index)]
+        database.close_connection()
+    
+    def _claim(self, channel):
+        """Claim the oldest due message of a channel, or return None if there is none"""
+        conn = database.get_connection()
+        while True:
+            now = time.time()
+            # Look up without the write lock - idle workers poll this
+            row = conn.execute('''
+                SELECT * FROM notification_outbox
+                WHERE channel = ? AND status = 'pending' AND next_attempt_at <= ?
+                ORDER BY next_attempt_at, id LIMIT 1
+            ''', (channel, now)).fetchone()
+            if row is None:
+                return None
+            with database.transaction() as conn:
+                claimed = conn.execute('''
+                    UPDATE notification_outbox SET status = 'sending', claimed_at = ?, attempts = attempts + 1
+                    WHERE id = ? AND status = 'pending'
+                ''', (now, row['id'])).rowcount
+            if claimed:
+                message = dict(row)
+                message['attempts'] += 1
+                return message
+            # Another worker was faster - look again
+    
+    def _idle_seconds(self, channel):
+        """Seconds until the channel's next retry is due (at most POLL_INTERVAL)"""
+        try:
+            due = database.get_connection().execute('''
+                SELECT MIN(next_attempt_at) FROM notification_outbox WHERE channel = ? AND status = 'pending'
+            ''', (channel,)).fetchone()[0]
+        except sqlite3.Error:
+            due = None
+        if due is None:
+            return self.POLL_INTERVAL
+        return min(max(due - time.time(), 0.05), self.POLL_INTERVAL)
+    
+    def _deliver(self, channel, message):
+        """Send a claimed message and record the outcome"""
+        label = f'{channel} message {message["id"]} (job {message["job_id"]}, attempt {message["attempts"]})'
         try:
+            self.senders[channel](json.loads(message['payload']))
+        except ChannelUnavailable as e:
+            logger.warning(f'⚠️  Notification {label} dropped: {e}')
+            self._finish(message['id'], 'failed', error=str(e))
+            self._count(channel, 'failed')
+        except Exception as e:
+            max_attempts = _positive_int_config('notification_max_attempts', 8)
+            if message['attempts'] >= max_attempts:
+                logger.error(f'❌ Notification {label} failed, giving up: {e}')
+                self._finish(message['id'], 'failed', error=str(e))
+                self._count(channel, 'failed')
+            else:
+                retry_delay = _positive_int_config('notification_retry_delay', 30)
+                delay = min(retry_delay * 2 ** (message['attempts'] - 1), self.MAX_RETRY_DELAY)
+                logger.warning(f'⚠️  Notification {label} failed, retrying in {delay}s: {e}')
+                self._finish(message['id'], 'pending', error=str(e), next_attempt_at=time.time() + delay)
+                self._count(channel, 'retries')
+        else:
+            sent_at = time.time()
+            self._finish(message['id'], 'sent', sent_at=sent_at)
+            with self._lock:
+                self._counts[channel]['sent'] += 1
+                self._lags[channel].append(sent_at - message['created_at'])
+            logger.info(f'✅ Notification {label} sent')
+    
+    def _finish(self, message_id, status, error=None, next_attempt_at=None, sent_at=None):
+        with database.transaction() as conn:
+            conn.execute('''
+                UPDATE notification_outbox
+                SET status = ?, last_error = ?, next_attempt_at = COALESCE(?, next_attempt_at), sent_at = ?, claimed_at = NULL
+                WHERE id = ?
+            ''', (status, error, next_attempt_at, sent_at, message_id))
+    
+    def _count(self, channel, outcome):
+        with self._lock:
+            self._counts[channel][outcome] += 1
+    
+    def _maintain(self):
+        """Periodically release abandoned claims and delete old sent/failed messages"""
+        while True:
+            try:
+                now = time.time()
+                with database.transaction() as conn:
+                    released = conn.execute('''
+                        UPDATE notification_outbox SET status = 'pending', claimed_at = NULL
+                        WHERE status = 'sending' AND claimed_at < ?
+                    ''', (now - self.CLAIM_TIMEOUT,)).rowcount
+                    deleted = conn.execute('''
+                        DELETE FROM notification_outbox
+                        WHERE status IN ('sent', 'failed') AND created_at < ?
+                    ''', (now - NOTIFICATION_RETENTION_DAYS * 86400,)).rowcount
+                if released:
+                    logger.warning(f'Notification outbox: released {released} abandoned message(s)')
+                    self.wake()
+                if deleted:
+                    logger.debug(f'Notification outbox: deleted {deleted} old message(s)')
+            except Exception as e:
+                logger.error(f'Notification outbox maintenance failed: {e}')
+            time.sleep(self.MAINTENANCE_INTERVAL)
+    
+    def retry_failed(self):
+        """
+        Queue all failed messages again
+        
+        Returns:
+            Number of messages queued
+        """
+        with database.transaction() as conn:
+            requeued = conn.execute('''
+                UPDATE notification_outbox SET status = 'pending', attempts = 0, next_attempt_at = ?
+                WHERE status = 'failed'
+            ''', (time.time(),)).rowcount
+        self.wake()
+        return requeued
+    
+    def stats(self):
+        """
+        Return the outbox backlog and delivery lag per channel
+        
+        Returns:
+            Dict with the settings and, per channel, messages pending, being
+            sent and failed (all processes), the age of the oldest pending
+            message, and this process's sent/retry counts and delivery lag
+            (queued to sent) over its last 100 deliveries
+        """
+        now = time.time()
+        rows = database.get_connection().execute('''
+            SELECT channel, status, COUNT(*) AS count, MIN(created_at) AS oldest
+            FROM notification_outbox
+            WHERE status != 'sent'
+            GROUP BY channel, status
+        ''').fetchall()
+        channels = {}
+        for channel in self.senders:
+            with self._lock:
+                counts = dict(self._counts[channel])
+                lags = list(self._lags[channel])
+            channels[channel] = {
+                'pending': 0,
+                'sending': 0,
+                'failed': 0,
+                'oldest_pending_seconds': None,
+                'sent': counts.get('sent', 0),
+                'retries': counts.get('retries', 0),
+                'avg_lag_ms': round(sum(lags) / len(lags) * 1000, 1) if lags else None,
+                'max_lag_ms': round(max(lags) * 1000, 1) if lags else None
+            }
+        for row in rows:
+            if row['channel'] not in channels:
+                continue
+            channels[row['channel']][row['status']] = row['count']
+            if row['status'] == 'pending':
+                channels[row['channel']]['oldest_pending_seconds'] = round(now - row['oldest'], 1)
+        return {
+            'concurrency': self.concurrency,
+            'max_attempts': _positive_int_config('notification_max_attempts', 8),
+            'retry_delay': _positive_int_config('notification_retry_delay', 30),
+            'channels': channels
+        }
+
+outbox = NotificationOutbox({'matterbridge': deliver_matterbridge, 'apprise': deliver_apprise})
+
+# ============================================================================
+# Scheduler Reconciliation
+# ============================================================================
+
+# Job id -> (name, schedule) as registered with APScheduler
+_scheduled = {}
+_reconcile_lock = threading.Lock()
+
+def _new_report():
+    return {'added': [], 'updated': [], 'removed': [], 'unchanged': 0, 'errors': []}
+
+def _reconcile_one(job_id, row, report):
+    """Bring one APScheduler entry in line with its job row (row None: deleted or disabled)"""
+    scheduler_id = f'job_{job_id}'
+    current = _scheduled.get(job_id)
+    
+    if row is None:
+        if current is not None:
+            try:
+                scheduler.remove_job(scheduler_id)
+            except JobLookupError:
+                pass
+            del _scheduled[job_id]
+            report['removed'].append(job_id)
+            logger.info(f'Unloaded job: {current[0]}')
+        return
+    
+    wanted = (row['name'], row['schedule'])
+    if current == wanted:
+        report['unchanged'] += 1
+        return
+    
+    try:
+        if current is None:
             scheduler.add_job(
                 func=execute_job,
-                args=[job['id']],
-                trigger=CronTrigger.from_crontab(job['schedule']),
-                id=f'job_{job["id"]}',
-                name=job['name'],
-                replace_existing=True
+                args=[job_id],
+                trigger=CronTrigger.from_crontab(row['schedule']),
+                id=scheduler_id,
+                name=row['name'],
+                replace_existing=True,
+                **job_options()
             )
-            logger.info(f'Loaded job: {job["name"]} ({job["schedule"]})')
-        except Exception as e:
-            logger.error(f'Failed to load job {job["name"]}: {e}')
+            report['added'].append(job_id)
+            logger.info(f'Loaded job: {row["name"]} ({row["schedule"]})')
+        else:
+            # Only a changed schedule gets a new trigger (and next run time)
+            if current[1] != row['schedule']:
+                scheduler.reschedule_job(scheduler_id, trigger=CronTrigger.from_crontab(row['schedule']))
+            if current[0] != row['name']:
+                scheduler.modify_job(scheduler_id, name=row['name'])
+            report['updated'].append(job_id)
+            logger.info(f'Updated job: {row["name"]} ({row["schedule"]})')
+        _scheduled[job_id] = wanted
+    except Exception as e:
+        logger.error(f'Failed to load job {row["name"]}: {e}')
+        report['errors'].append({'id': job_id, 'name': row['name'], 'error': str(e)})
+        # Like a job that never loaded: not scheduled until its schedule is fixed
+        if current is not None:
+            try:
+                scheduler.remove_job(scheduler_id)
+            except JobLookupError:
+                pass
+            del _scheduled[job_id]
+
+def reconcile_scheduler(job_ids=None):
+    """
+    Bring the APScheduler entries in line with the jobs table
+    
+    Only entries whose job was added, changed, disabled or deleted are touched -
+    unchanged jobs keep their trigger and next run time, and crons are only
+    parsed for new or changed schedules.
+    
+    Args:
+        job_ids: Reconcile only these jobs (after a create, update, delete or
+            import); None reconciles all jobs, including entries whose job is gone
+    
+    Returns:
+        Dict with the added, updated and removed job IDs, the number of
+        unchanged jobs and errors for schedules that could not be loaded
+    """
+    report = _new_report()
+    with _reconcile_lock:
+        conn = database.get_connection()
+        if job_ids is None:
+            rows = conn.execute('SELECT id, name, schedule FROM jobs WHERE enabled = 1').fetchall()
+        else:
+            job_ids = sorted(set(job_ids))
+            rows = conn.execute(
+                'SELECT id, name, schedule FROM jobs WHERE enabled = 1 AND id IN (SELECT value FROM json_each(?))',
+                (json.dumps(job_ids),)
+            ).fetchall()
+        conn.close()
+        
+        desired = {row['id']: row for row in rows}
+        if job_ids is None:
+            job_ids = sorted(set(_scheduled) | set(desired))
+        for job_id in job_ids:
+            _reconcile_one(job_id, desired.get(job_id), report)
+    
+    changed = len(report['added']) + len(report['updated']) + len(report['removed'])
+    if changed or report['errors']:
+        logger.info(f'Scheduler reconciled: {len(report["added"])} added, {len(report["updated"])} updated, '
+                    f'{len(report["removed"])} removed, {report["unchanged"]} unchanged, {len(report["errors"])} errors')
+    return report
 
 # ============================================================================
 # Load Jobs into Scheduler (Module Level - runs at startup)
 # ============================================================================
 
+apply_execution_settings()
 logger.info('Loading jobs into scheduler...')
-reload_scheduler()
+reconcile_scheduler()
 logger.info('✓ Jobs loaded')
+outbox.apply_settings()
 
 # Startup warning if no notification service is configured/enabled
 _mb_enabled = get_config('matterbridge_enabled', 'false') == 'true'
@@ -900,9 +1537,7 @@ def create_job():
         conn.commit()
         conn.close()
         
-        reload_scheduler()
-        
-        return jsonify({'success': True, 'id': job_id})
+        return jsonify({'success': True, 'id': job_id, 'scheduler': reconcile_scheduler([job_id])})
     
     except sqlite3.IntegrityError:
         conn.close()
@@ -957,9 +1592,7 @@ def update_job(job_id):
     
     conn.close()
     
-    reload_scheduler()
-    
-    return jsonify({'success': True})
+    return jsonify({'success': True, 'scheduler': reconcile_scheduler([job_id])})
 
 @app.route('/api/jobs/<int:job_id>', methods=['DELETE'])
 @require_token
@@ -974,9 +1607,47 @@ def delete_job(job_id):
     if not deleted:
         return jsonify({'success': False, 'error': 'Job not found'}), 404
     
-    reload_scheduler()
+    return jsonify({'success': True, 'scheduler': reconcile_scheduler([job_id])})
+
+@app.route('/api/jobs/import', methods=['POST'])
+@require_token
+def import_jobs():
+    """Create many jobs in one transaction and schedule them in one reconciliation pass"""
+    data = request.json
     
-    return jsonify({'success': True})
+    jobs = data.get('jobs') if isinstance(data, dict) else None
+    if not isinstance(jobs, list) or not jobs:
+        return jsonify({'success': False, 'error': 'Missing required field: jobs (non-empty list)'}), 400
+    
+    required_fields = ['name', 'url', 'schedule']
+    for idx, job in enumerate(jobs):
+        for field in required_fields:
+            if not isinstance(job, dict) or not job.get(field):
+                return jsonify({'success': False, 'error': f'Job {idx}: missing required field: {field}'}), 400
+    
+    job_ids = []
+    try:
+        with database.transaction() as conn:
+            for job in jobs:
+                cursor = conn.execute('''
+                    INSERT INTO jobs (name, url, schedule, enabled, notify_enabled, priority)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', (
+                    job['name'],
+                    job['url'],
+                    job['schedule'],
+                    job.get('enabled', True),
+                    job.get('notify_enabled', False),
+                    job.get('priority', False)
+                ))
+                job_ids.append(cursor.lastrowid)
+    except sqlite3.IntegrityError:
+        return jsonify({'success': False, 'error': 'Job name already exists (no jobs were imported)'}), 400
+    
+    report = reconcile_scheduler(job_ids)
+    logger.info(f'Imported {len(job_ids)} jobs')
+    
+    return jsonify({'success': True, 'ids': job_ids, 'scheduler': report})
 
 @app.route('/api/jobs/<int:job_id>/run', methods=['POST'])
 @require_token
@@ -990,15 +1661,36 @@ def run_job_now(job_id):
     if not job:
         return jsonify({'success': False, 'error': 'Job not found'}), 404
     
+    # execute_job would skip the run - report it instead of claiming it started
+    with _execution_lock:
+        running = _running_jobs[job_id]
+    if running >= _execution['max_instances']:
+        return jsonify({'success': False, 'error': f'Job is already running ({running} of max {_execution["max_instances"]} run(s))'}), 409
+    
     scheduler.add_job(
         func=execute_job,
         args=[job_id],
         id=f'manual_{job_id}_{datetime.now().timestamp()}',
-        name=f'Manual: {job["name"]}'
+        name=f'Manual: {job["name"]}',
+        misfire_grace_time=_execution['misfire_grace_time']
     )
     
     return jsonify({'success': True, 'message': 'Job execution started'})
 
+@app.route('/api/scheduler/status', methods=['GET'])
+@require_token
+def scheduler_status():
+    """Execution settings, live queue depth and notification backlog (polled by the dashboard)"""
+    return jsonify({'success': True, 'execution': execution_stats(), 'notifications': outbox.stats()})
+
+@app.route('/api/notifications/retry', methods=['POST'])
+@require_token
+def retry_notifications():
+    """Queue notifications that failed after all attempts again"""
+    requeued = outbox.retry_failed()
+    logger.info(f'Requeued {requeued} failed notification(s)')
+    return jsonify({'success': True, 'requeued': requeued})
+
 # ============================================================================
 # API Routes - Configuration
 # ============================================================================
@@ -1034,9 +1726,8 @@ def get_config_api():
 def update_config():
     data = request.json
     
-    conn = database.get_connection()
-    cursor = conn.cursor()
-    
+    # Encrypt first - the write lock is only held for the inserts
+    rows = []
     for key, value in data.items():
         if key in SENSITIVE_KEYS and value == '***':
             continue
@@ -1045,16 +1736,20 @@ def update_config():
             value = database.normalize_url(value)
         
         stored_value = encrypt_value(value) if key in SENSITIVE_KEYS else value
-        
-        cursor.execute('''
+        rows.append((key, stored_value, datetime.now()))
+    
+    with database.transaction() as conn:
+        conn.executemany('''
             INSERT OR REPLACE INTO global_config (key, value, updated_at)
             VALUES (?, ?, ?)
-        ''', (key, stored_value, datetime.now()))
-        
-        logger.info(f'Config updated: {key}' + (' (encrypted)' if key in SENSITIVE_KEYS else ''))
+        ''', rows)
+        database.bump_config_generation(conn)
+    config_cache.reload()
+    apply_execution_settings()
+    outbox.apply_settings()
     
-    conn.commit()
-    conn.close()
+    for key, _, _ in rows:
+        logger.info(f'Config updated: {key}' + (' (encrypted)' if key in SENSITIVE_KEYS else ''))
     
     return jsonify({'success': True})
 
@@ -1122,7 +1817,11 @@ def check_services():
                 'scheduler_running': scheduler.running,
                 'total_jobs': total_jobs,
                 'active_jobs': active_jobs,
-                'success_rate': f'{int((success_jobs/total_jobs*100) if total_jobs > 0 else 0)}%'
+                'success_rate': f'{int((success_jobs/total_jobs*100) if total_jobs > 0 else 0)}%',
+                'database': database.stats(),
+                'config_cache': config_cache.stats(),
+                'execution': execution_stats(),
+                'notifications': outbox.stats()
             }
         }
     except Exception as e:
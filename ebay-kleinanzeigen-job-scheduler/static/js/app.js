@@ -315,7 +315,16 @@ const translations = {
         passwordChangeNote: '⚠️ Note: After changing your password, you will be logged out and need to sign in again with your new password.',
         passwordChanged: 'Password changed successfully! Redirecting to login...',
         priorityLabel: '🔔 Priority Job',
-        priorityDesc: 'When enabled, notifications for this job will include <strong>@everyone</strong> at the end of the title to alert all channel members.'
+        priorityDesc: 'When enabled, notifications for this job will include <strong>@everyone</strong> at the end of the title to alert all channel members.',
+        runningJobs: 'Running',
+        queuedJobs: 'Queued',
+        scraperSlots: 'Scraper Calls',
+        threads: 'threads',
+        waitingForSlot: 'waiting for a slot',
+        skippedMissed: 'skipped / missed',
+        pendingNotifications: 'Notifications',
+        pendingFailed: 'pending / failed',
+        avgLag: 'avg. delay'
     },
     de: {
         appTitle: '<img src="/static/logo.svg" alt="logo" style="height: 1.5em; vertical-align: middle; margin-right: 0.4em;">kleinanzeigen tracker',
@@ -403,7 +412,16 @@ const translations = {
         passwordChangeNote: '⚠️ Hinweis: Nach der Änderung Ihres Passworts werden Sie abgemeldet und müssen sich mit Ihrem neuen Passwort erneut anmelden.',
         passwordChanged: 'Passwort erfolgreich geändert! Weiterleitung zur Anmeldung...',
         priorityLabel: '🔔 Prioritäts-Job',
-        priorityDesc: 'Wenn aktiviert, enthalten Benachrichtigungen für diesen Job <strong>@everyone</strong> am Ende des Titels, um alle Kanalmitglieder zu benachrichtigen.'
+        priorityDesc: 'Wenn aktiviert, enthalten Benachrichtigungen für diesen Job <strong>@everyone</strong> am Ende des Titels, um alle Kanalmitglieder zu benachrichtigen.',
+        runningJobs: 'Laufend',
+        queuedJobs: 'Wartend',
+        scraperSlots: 'Scraper-Aufrufe',
+        threads: 'Threads',
+        waitingForSlot: 'warten auf einen Platz',
+        skippedMissed: 'übersprungen / verpasst',
+        pendingNotifications: 'Benachrichtigungen',
+        pendingFailed: 'ausstehend / fehlgeschlagen',
+        avgLag: 'Ø Verzögerung'
     }
 };
 
@@ -613,6 +631,7 @@ function showApp() {
     document.getElementById('currentUser').textContent = currentUser.username;
     loadJobs();
     loadConfig();
+    startExecutionPolling();
 }
 
 // API Helper
@@ -681,6 +700,7 @@ async function loadJobs() {
         }
 
         updateStats(jobs);
+        loadExecutionStatus();
     } catch (error) {
         console.error('Failed to load jobs:', error);
     } finally {
@@ -736,6 +756,53 @@ function renderJobs(jobs) {
     `}).join('');
 }
 
+// Live execution state (queue depth, running jobs, scraper slots)
+let executionTimer = null;
+
+function startExecutionPolling() {
+    if (executionTimer) clearInterval(executionTimer);
+    executionTimer = setInterval(() => {
+        const jobsTab = document.getElementById('jobsTab');
+        if (!accessToken) {
+            clearInterval(executionTimer);
+            executionTimer = null;
+        } else if (!document.hidden && jobsTab.classList.contains('active')) {
+            loadExecutionStatus();
+        }
+    }, 5000);
+}
+
+async function loadExecutionStatus() {
+    try {
+        const data = await apiCall('/api/scheduler/status');
+        renderExecutionStatus(data.execution);
+        renderNotificationStatus(data.notifications);
+    } catch (error) {
+        console.error('Failed to load execution status:', error);
+    }
+}
+
+function renderExecutionStatus(execution) {
+    const t = translations[currentLanguage];
+    document.getElementById('runningJobs').textContent = execution.running;
+    document.getElementById('executorPool').textContent = `${execution.pool_size} ${t.threads}`;
+    document.getElementById('queuedJobs').textContent = execution.queued;
+    document.getElementById('skippedRuns').textContent = `${execution.skipped_overlaps} / ${execution.missed_runs} ${t.skippedMissed}`;
+    document.getElementById('scraperSlots').textContent = `${execution.scrapes_in_flight} / ${execution.max_concurrent_scrapes}`;
+    document.getElementById('scraperWaiting').textContent = `${execution.waiting_for_scraper} ${t.waitingForSlot}`;
+}
+
+function renderNotificationStatus(notifications) {
+    const t = translations[currentLanguage];
+    const channels = Object.values(notifications.channels);
+    const pending = channels.reduce((sum, c) => sum + c.pending + c.sending, 0);
+    const failed = channels.reduce((sum, c) => sum + c.failed, 0);
+    const lags = channels.filter(c => c.avg_lag_ms !== null).map(c => c.avg_lag_ms);
+    const lag = lags.length ? ` · ${t.avgLag} ${(Math.max(...lags) / 1000).toFixed(1)}s` : '';
+    document.getElementById('pendingNotifications').textContent = `${pending} / ${failed}`;
+    document.getElementById('notificationLag').textContent = `${t.pendingFailed}${lag}`;
+}
+
 function updateStats(jobs) {
     document.getElementById('totalJobs').textContent = jobs.length;
     document.getElementById('activeJobs').textContent = jobs.filter(j => j.enabled).length;
@@ -1029,6 +1096,17 @@ function renderConfig(config) {
                     <small style="color:var(--text-secondary);">${description}</small>
                 </div>`;
         }
+        if (key === 'job_coalesce') {
+            return `
+                <div class="form-group">
+                    <label for="config-${key}">${key.replace(/_/g, ' ').toUpperCase()}</label>
+                    <select id="config-${key}" data-key="${key}">
+                        <option value="true" ${value === 'true' ? 'selected' : ''}>true</option>
+                        <option value="false" ${value === 'false' ? 'selected' : ''}>false</option>
+                    </select>
+                    <small style="color:var(--text-secondary);">${description}</small>
+                </div>`;
+        }
         if (key === 'default_job_schedule') {
             const cronReadable = cronToReadable(value);
             const cronHelp = lang === 'de'
@@ -1068,6 +1146,14 @@ function renderConfig(config) {
             apprise_api_key:        'Apprise notification key/ID (e.g. kleinanzeigen) — messages are sent to POST /notify/{key}',
             apprise_username:       'Optional: HTTP Basic Auth username — only needed if Apprise is behind a reverse proxy with authentication enabled',
             apprise_password:       'Optional: HTTP Basic Auth password — only needed if Apprise is behind a reverse proxy with authentication enabled',
+            executor_pool_size:     'Number of threads running jobs',
+            job_max_instances:      'Maximum concurrent runs of the same job — further runs are skipped while it is still running',
+            job_coalesce:           'After a stall, run a job once instead of once per missed run',
+            job_misfire_grace_time: 'Seconds a run may start late before it is skipped as missed',
+            max_concurrent_scrapes: 'Maximum Scraper API calls in flight across all jobs — further jobs wait for a slot',
+            notification_concurrency:  'Delivery workers per notification channel (Matterbridge, Apprise)',
+            notification_max_attempts: 'Attempts per notification before it is marked as failed',
+            notification_retry_delay:  'Seconds before the first retry of a failed notification — doubled with every further attempt',
         },
         de: {
             scraper_api_url:        'Ebay Kleinanzeigen Scraper API Basis-URL',
@@ -1083,6 +1169,14 @@ function renderConfig(config) {
             apprise_api_key:        'Apprise Benachrichtigungsschlüssel (z.B. kleinanzeigen) — Nachrichten werden an POST /notify/{key} gesendet',
             apprise_username:       'Optional: HTTP Basic Auth Benutzername — nur nötig, wenn Apprise hinter einem Reverse Proxy mit Authentifizierung betrieben wird',
             apprise_password:       'Optional: HTTP Basic Auth Passwort — nur nötig, wenn Apprise hinter einem Reverse Proxy mit Authentifizierung betrieben wird',
+            executor_pool_size:     'Anzahl der Threads, die Jobs ausführen',
+            job_max_instances:      'Maximale gleichzeitige Ausführungen desselben Jobs — weitere werden übersprungen, solange er noch läuft',
+            job_coalesce:           'Nach einem Stillstand einen Job einmal statt einmal pro verpasster Ausführung starten',
+            job_misfire_grace_time: 'Sekunden, die eine Ausführung zu spät starten darf, bevor sie als verpasst übersprungen wird',
+            max_concurrent_scrapes: 'Maximale gleichzeitige Scraper-API-Aufrufe über alle Jobs — weitere Jobs warten auf einen Platz',
+            notification_concurrency:  'Zustell-Worker pro Benachrichtigungskanal (Matterbridge, Apprise)',
+            notification_max_attempts: 'Versuche pro Benachrichtigung, bevor sie als fehlgeschlagen markiert wird',
+            notification_retry_delay:  'Sekunden bis zum ersten erneuten Versuch einer fehlgeschlagenen Benachrichtigung — verdoppelt sich mit jedem weiteren Versuch',
         }
     };
 
@@ -1093,6 +1187,8 @@ function renderConfig(config) {
         en: {
             scraper:        '🔍 Scraper API',
             general:        '⚙️ General Settings',
+            execution:      '⏱️ Job Execution',
+            delivery:       '📨 Notification Delivery',
             matterbridge:   '💬 Matterbridge',
             matterbridgeDesc: 'Connect to a Matterbridge instance to forward notifications to chat platforms (Matrix, Slack, Discord, …)',
             apprise:        '🔔 Apprise',
@@ -1101,6 +1197,8 @@ function renderConfig(config) {
         de: {
             scraper:        '🔍 Scraper API',
             general:        '⚙️ Allgemeine Einstellungen',
+            execution:      '⏱️ Job-Ausführung',
+            delivery:       '📨 Benachrichtigungszustellung',
             matterbridge:   '💬 Matterbridge',
             matterbridgeDesc: 'Mit einer Matterbridge-Instanz verbinden, um Benachrichtigungen an Chat-Plattformen weiterzuleiten (Matrix, Slack, Discord, …)',
             apprise:        '🔔 Apprise',
@@ -1152,6 +1250,28 @@ function renderConfig(config) {
 
         <hr style="border:none;border-top:1px solid var(--border);margin:20px 0;">
 
+        <!-- ── Job Execution ── -->
+        <div class="config-section">
+            <h3 style="margin-bottom:12px;font-size:15px;">${l.execution}</h3>
+            ${fieldHtml('executor_pool_size',      config.executor_pool_size?.value      || '10', d.executor_pool_size)}
+            ${fieldHtml('job_max_instances',       config.job_max_instances?.value       || '1', d.job_max_instances)}
+            ${fieldHtml('job_coalesce',            config.job_coalesce?.value            || 'true', d.job_coalesce)}
+            ${fieldHtml('job_misfire_grace_time',  config.job_misfire_grace_time?.value  || '60', d.job_misfire_grace_time)}
+            ${fieldHtml('max_concurrent_scrapes',  config.max_concurrent_scrapes?.value  || '4', d.max_concurrent_scrapes)}
+        </div>
+
+        <hr style="border:none;border-top:1px solid var(--border);margin:20px 0;">
+
+        <!-- ── Notification Delivery ── -->
+        <div class="config-section">
+            <h3 style="margin-bottom:12px;font-size:15px;">${l.delivery}</h3>
+            ${fieldHtml('notification_concurrency',   config.notification_concurrency?.value   || '2', d.notification_concurrency)}
+            ${fieldHtml('notification_max_attempts',  config.notification_max_attempts?.value  || '8', d.notification_max_attempts)}
+            ${fieldHtml('notification_retry_delay',   config.notification_retry_delay?.value   || '30', d.notification_retry_delay)}
+        </div>
+
+        <hr style="border:none;border-top:1px solid var(--border);margin:20px 0;">
+
         <!-- ── Matterbridge ── -->
         <div class="notification-section">
             <div style="display:flex;align-items:center;gap:14px;">
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Offline parse-throughput benchmark for the scraper's extraction path
+
+Runs every fixture page in benchmarks/fixtures/ through the same steps
+_scrape_page uses - no network, no rate limiter:
+
+- buffered:  parse the page bytes (declared charset), find articles, extract
+             every listing, read the next page link
+- streaming: feed the raw bytes in SCRAPER_STREAM_CHUNK_SIZE chunks to the
+             incremental parser and extract while it parses (the since-watermark path)
+
+Each backend/mode runs in its own subprocess so peak RSS is not inflated by
+earlier runs. Results are compared against benchmarks/baseline.json; a
+throughput drop or p99/RSS increase beyond the tolerance exits with code 1.
+
+Usage (from the scraper directory):
+    python benchmarks/bench_parse.py                   # run and compare
+    python benchmarks/bench_parse.py --save-baseline   # run and store as new baseline
+    python benchmarks/bench_parse.py --backends lxml --iterations 50
+"""
+
+import argparse
+import gc
+import glob
+import gzip
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCH_DIR, 'fixtures')
+BASELINE_FILE = os.path.join(BENCH_DIR, 'baseline.json')
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import extraction
+
+MODES = ('buffered', 'streaming')
+CHUNK_SIZE = 16384  # SCRAPER_STREAM_CHUNK_SIZE default
+NEVER_REACHED = '1'  # since watermark older than every fixture listing - parse whole pages
+
+def load_fixtures():
+    """Return [(name, raw bytes)] for every fixture, sorted by name"""
+    fixtures = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, '*.html.gz'))):
+        with gzip.open(path, 'rb') as f:
+            fixtures.append((os.path.basename(path)[:-len('.html.gz')], f.read()))
+    return fixtures
+
+def run_buffered(parser, raw):
+    """Parse a fully downloaded page - returns listings extracted"""
+    document = parser.parse(raw, encoding='utf-8')
+    watermark = extraction.Watermark(None)
+    count = 0
+    for article in parser.articles(document):
+        if watermark.reached(parser.extract(article)):
+            break
+        count += 1
+    parser.next_page(document)
+    return count
+
+def run_streaming(parser, raw):
+    """Parse a page chunk by chunk while 'downloading' - returns listings extracted"""
+    chunks = (raw[i:i + CHUNK_SIZE] for i in range(0, len(raw), CHUNK_SIZE))
+    page = parser.stream(chunks, encoding='utf-8')
+    watermark = extraction.Watermark(NEVER_REACHED)
+    count = 0
+    for article in page:
+        if watermark.reached(parser.extract(article)):
+            break
+        count += 1
+    page.next_page
+    return count
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None where unavailable)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+def measure(backend_name, mode, iterations):
+    """Benchmark one backend/mode in this process"""
+    parser = extraction.get_backend(backend_name)
+    run = run_buffered if mode == 'buffered' else run_streaming
+    fixtures = load_fixtures()
+    
+    # Warm-up (imports, compiled XPaths, allocator)
+    listings_per_pass = sum(run(parser, raw) for _, raw in fixtures)
+    
+    latencies = []
+    gc.collect()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for _, raw in fixtures:
+            page_start = time.perf_counter()
+            run(parser, raw)
+            latencies.append(time.perf_counter() - page_start)
+    elapsed = time.perf_counter() - start
+    
+    return {
+        'pages': len(latencies),
+        'listings': listings_per_pass,
+        'listingsPerSecond': round(listings_per_pass * iterations / elapsed, 1),
+        'p50Ms': round(percentile(latencies, 0.50) * 1000, 3),
+        'p99Ms': round(percentile(latencies, 0.99) * 1000, 3),
+        'peakRssMb': peak_rss_mb()
+    }
+
+def measure_isolated(backend_name, mode, iterations):
+    """Benchmark one backend/mode in a fresh interpreter"""
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', f'{backend_name}/{mode}', '--iterations', str(iterations)],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output)
+
+def compare(name, result, baseline, tolerance):
+    """Return regression messages for one backend/mode"""
+    if baseline is None:
+        return []
+    problems = []
+    if result['listings'] != baseline['listings']:
+        problems.append(f'{name}: extracted {result["listings"]} listings per corpus pass, baseline {baseline["listings"]} (extraction output changed)')
+    if result['listingsPerSecond'] < baseline['listingsPerSecond'] * (1 - tolerance):
+        problems.append(f'{name}: {result["listingsPerSecond"]} listings/s, baseline {baseline["listingsPerSecond"]}')
+    if result['p99Ms'] > baseline['p99Ms'] * (1 + tolerance):
+        problems.append(f'{name}: p99 {result["p99Ms"]} ms, baseline {baseline["p99Ms"]} ms')
+    if result['peakRssMb'] and baseline.get('peakRssMb') and result['peakRssMb'] > baseline['peakRssMb'] * (1 + tolerance):
+        problems.append(f'{name}: peak RSS {result["peakRssMb"]} MB, baseline {baseline["peakRssMb"]} MB')
+    return problems
+
+def delta(value, reference):
+    """Format the relative change against the baseline"""
+    if not reference:
+        return ''
+    return f' ({(value - reference) / reference * 100:+.0f}%)'
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Offline parse-throughput benchmark')
+    arg_parser.add_argument('--backends', default=','.join(extraction.BACKENDS), help='Comma-separated backends (default: all)')
+    arg_parser.add_argument('--iterations', type=int, default=20, help='Passes over the corpus per backend/mode')
+    arg_parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed relative regression (default: 0.25)')
+    arg_parser.add_argument('--baseline', default=BASELINE_FILE, help='Baseline file to compare against / save to')
+    arg_parser.add_argument('--save-baseline', action='store_true', help='Store these results as the new baseline')
+    arg_parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+    
+    if args.child:
+        backend_name, mode = args.child.split('/')
+        print(json.dumps(measure(backend_name, mode, args.iterations)))
+        return 0
+    
+    fixtures = load_fixtures()
+    if not fixtures:
+        print(f'No fixtures in {FIXTURES_DIR} - run benchmarks/make_fixtures.py first')
+        return 2
+    print(f'Corpus: {len(fixtures)} pages ({", ".join(name for name, _ in fixtures)}), {args.iterations} iterations')
+    
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+    
+    results = {}
+    problems = []
+    for backend_name in args.backends.split(','):
+        parser = extraction.get_backend(backend_name)
+        for mode in MODES:
+            if mode == 'streaming' and not parser.supports_streaming:
+                continue
+            name = f'{backend_name}/{mode}'
+            result = results[name] = measure_isolated(backend_name, mode, args.iterations)
+            reference = baseline.get(name, {})
+            print(f'{name:16} {result["listingsPerSecond"]:>10.1f} listings/s{delta(result["listingsPerSecond"], reference.get("listingsPerSecond"))}'
+                  f'  p50 {result["p50Ms"]:.2f} ms  p99 {result["p99Ms"]:.2f} ms{delta(result["p99Ms"], reference.get("p99Ms"))}'
+                  f'  peak RSS {result["peakRssMb"]} MB')
+            problems.extend(compare(name, result, baseline.get(name), args.tolerance))
+    
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'iterations': args.iterations,
+                'results': results
+            }, f, indent=2)
+            f.write('\n')
+        print(f'Baseline saved to {args.baseline}')
+        return 0
+    
+    if problems:
+        print(f'\n✗ {len(problems)} regression(s) beyond {args.tolerance:.0%}:')
+        for problem in problems:
+            print(f'  {problem}')
+        return 1
+    print(f'\n✓ No regressions beyond {args.tolerance:.0%}' if baseline else '\nNo baseline - run with --save-baseline to create one')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
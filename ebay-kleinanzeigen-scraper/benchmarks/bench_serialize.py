@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Response serialization benchmark for the scraper's listing payloads
+
+Builds an /api/scrape-style response with N listings extracted from the
+fixture corpus (benchmarks/fixtures/) and compares:
+
+- dict + json:      listings as dictionaries, Flask's default stdlib provider
+                    (how responses were encoded before extraction.Listing)
+- Listing + json:   Listing records, ListingJSONProvider without orjson
+- Listing + orjson: Listing records, ListingJSONProvider with orjson (default)
+
+Reported per variant: response body size, median and p99 encode time (the full
+jsonify path: provider.response()), plus the cost of sorting the listings
+newest first and the memory held per listing.
+
+Usage (from the scraper directory):
+    python benchmarks/bench_serialize.py
+    python benchmarks/bench_serialize.py --listings 1000 --iterations 500
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+import extraction
+import serialization
+from bench_parse import load_fixtures, percentile
+
+def corpus_listings(count):
+    """Return `count` listings extracted from the fixtures (repeated as needed, unique unordered IDs)"""
+    parser = extraction.get_backend('lxml')
+    extracted = [listing for _, raw in load_fixtures() for listing in parser.extract_all(raw, encoding='utf-8')]
+    listings = []
+    while extracted and len(listings) < count:
+        fields = extracted[len(listings) % len(extracted)].to_dict()
+        fields['id'] = str(3100000000 + len(listings) * 7919 % 1000003)
+        listings.append(extraction.Listing(**fields))
+    return listings
+
+def response_payload(listings):
+    """An /api/scrape response body around the listings"""
+    return {
+        'success': True,
+        'urls': ['/s-wohnzimmer/muenchen/tisch/k0c88l6411', '/s-autos/c216'],
+        'urlCount': 2,
+        'scrapedAt': '2026-01-04T15:00:00Z',
+        'count': len(listings),
+        'listings': listings,
+        'errors': [],
+        'pagination': [{'url': '/s-autos/c216', 'pages': 3, 'stopReason': 'watermark'}],
+        'cached': False,
+        'cacheAgeSeconds': None
+    }
+
+def time_encode(provider, payload, iterations):
+    """Return (body bytes, encode latencies) for provider.response(payload)"""
+    body = provider.response(payload).get_data()
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        provider.response(payload)
+        latencies.append(time.perf_counter() - start)
+    return body, latencies
+
+def time_sort(listings, key, iterations):
+    """Median seconds to sort a copy of the listings newest first"""
+    latencies = []
+    for _ in range(iterations):
+        batch = list(listings)
+        start = time.perf_counter()
+        batch.sort(key=key, reverse=True)
+        latencies.append(time.perf_counter() - start)
+    return percentile(latencies, 0.5)
+
+def bytes_per_listing(build, count=5000):
+    """Memory allocated per listing built by `build`"""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = [build(i) for i in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del kept
+    return allocated / count
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Response serialization benchmark')
+    arg_parser.add_argument('--listings', type=int, default=200, help='Listings per response (default: 200)')
+    arg_parser.add_argument('--iterations', type=int, default=200, help='Encodes per variant (default: 200)')
+    args = arg_parser.parse_args()
+    
+    listings = corpus_listings(args.listings)
+    if not listings:
+        print(f'No fixtures in {os.path.join(BENCH_DIR, "fixtures")} - run benchmarks/make_fixtures.py first')
+        return 2
+    records = response_payload(listings)
+    dicts = response_payload([listing.to_dict() for listing in listings])
+    
+    app = Flask(__name__)
+    stdlib_provider = DefaultJSONProvider(app)
+    listing_provider = serialization.ListingJSONProvider(app)
+    
+    print(f'Payload: {len(listings)} listings, {args.iterations} iterations')
+    results = [('dict + json', *time_encode(stdlib_provider, dicts, args.iterations))]
+    # ListingJSONProvider's stdlib fallback
+    orjson_module = serialization.orjson
+    try:
+        serialization.orjson = None
+        results.append(('Listing + json', *time_encode(listing_provider, records, args.iterations)))
+    finally:
+        serialization.orjson = orjson_module
+    if orjson_module is not None:
+        results.append(('Listing + orjson', *time_encode(listing_provider, records, args.iterations)))
+    else:
+        print('orjson not installed - Listing + orjson skipped')
+    
+    reference_size, reference_latencies = len(results[0][1]), results[0][2]
+    reference_median = percentile(reference_latencies, 0.5)
+    for name, body, latencies in results:
+        median = percentile(latencies, 0.5)
+        print(f'{name:18} {len(body):>8} bytes ({(len(body) - reference_size) / reference_size * 100:+.0f}%)'
+              f'  median {median * 1000:.3f} ms  p99 {percentile(latencies, 0.99) * 1000:.3f} ms'
+              f'  ({reference_median / median:.1f}x)')
+    
+    dict_sort = time_sort(dicts['listings'], lambda x: int(x['id']), args.iterations)
+    record_sort = time_sort(listings, lambda listing: listing.id_number, args.iterations)
+    print(f'\nSort newest first: int(x["id"]) {dict_sort * 1e6:.1f} us, Listing.id_number {record_sort * 1e6:.1f} us')
+    
+    template = listings[0].to_dict()
+    dict_bytes = bytes_per_listing(lambda i: {**template, 'id': str(i), 'additional_info': []})
+    record_bytes = bytes_per_listing(lambda i: extraction.Listing(**{**template, 'id': str(i), 'additional_info': []}))
+    print(f'Memory per listing: dict {dict_bytes:.0f} bytes, Listing {record_bytes:.0f} bytes')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
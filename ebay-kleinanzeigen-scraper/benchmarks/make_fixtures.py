@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Generate the search page corpus for the parse benchmark
+
+Writes deterministic, gzipped kleinanzeigen.de-style search result pages to
+benchmarks/fixtures/ - same markup structure the extraction backends read
+(article.aditem, top ads, PRO badges, simpletags, pagination) plus the page
+chrome (inline scripts, styles, category navigation) that makes up most of a
+real page's weight. The corpus is committed, so only re-run this after
+changing the generator:
+
+    python benchmarks/make_fixtures.py
+
+Pages saved from kleinanzeigen.de (e.g. bodies from a SCRAPER_CAPTURE_MODE=record
+capture directory) can be added next to them as <name>.html.gz - bench_parse.py
+picks up every fixture.
+"""
+
+import gzip
+import os
+import random
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+LOCATIONS = [
+    ('80809', 'Milbertshofen - Am Hart', 3),
+    ('10115', 'Mitte', 12),
+    ('50667', 'Innenstadt', 1),
+    ('20095', 'Hamburg-Altstadt', 27),
+    ('70173', 'Stuttgart-Mitte', 8)
+]
+TITLES = ['Designer Couchtisch', 'Fahrrad 28 Zoll', 'iPhone 13 128GB', 'Kinderwagen Bugaboo', 'Sofa & Sessel Set', 'E-Gitarre Fender']
+TAGS = [('Automatik', '98.000 km'), ('Neu',), ('Gebraucht', 'Sehr gut'), ()]
+SHIPPING = ['Versand möglich', 'Nur Abholung', None]
+
+def article(rnd, adid, topad=False, pro=False, price=True):
+    """One search result entry (li > article.aditem)"""
+    li_class = 'ad-listitem fully-clickable-card' + (' badge-topad is-topad' if topad else '')
+    article_class = 'aditem' + (' is-highlight' if rnd.random() < 0.05 else '')
+    zip_code, district, distance = rnd.choice(LOCATIONS)
+    title = f'{rnd.choice(TITLES)} {adid % 1000}'
+    tags = ''.join(f'<span class="simpletag">{tag}</span>' for tag in rnd.choice(TAGS))
+    shipping = rnd.choice(SHIPPING)
+    if shipping:
+        tags += f'<span class="simpletag">{shipping}</span>'
+    if rnd.random() < 0.1:
+        tags += '<span class="simpletag">Direkt kaufen</span>'
+    price_html = f'<p class="aditem-main--middle--price-shipping--price">\n {adid % 900 + 5} € {rnd.choice(["VB", ""])}\n</p>' if price else ''
+    pro_html = '<span class="badge-hint-pro-small-srp">PRO</span>' if pro else ''
+    images = f'<div class="galleryimage--counter">{rnd.randint(1, 20)}</div>' if rnd.random() < 0.8 else ''
+    return f'''
+<li class="{li_class}">
+<article class="{article_class}" data-adid="{adid}" data-href="/s-anzeige/{title.lower().replace(' ', '-')}/{adid}-88-6411">
+  <div class="aditem-image">
+    <a href="/s-anzeige/x/{adid}-88-6411">
+      <div class="imagebox srpimagebox">
+        <img src="https://img.kleinanzeigen.de/api/v1/prod-ads/images/{adid % 97:02x}/{adid}?rule=$_2.JPG" srcset="https://img.kleinanzeigen.de/api/v1/prod-ads/images/{adid % 97:02x}/{adid}?rule=$_35.JPG" alt="{title}" loading="lazy"/>
+        {images}
+      </div>
+    </a>
+  </div>
+  <div class="aditem-main">
+    <div class="aditem-main--top">
+      <div class="aditem-main--top--left"><i class="icon icon-small icon-pin-gray"></i> {zip_code} {district} &#8203;({distance} km)</div>
+      <div class="aditem-main--top--right"><i class="icon icon-small icon-calendar-open"></i> {rnd.choice(["Heute", "Gestern"])}, {rnd.randint(0, 23):02d}:{rnd.randint(0, 59):02d}</div>
+    </div>
+    <div class="aditem-main--middle">
+      <h2 class="text-module-begin"><a class="ellipsis" href="/s-anzeige/x/{adid}-88-6411">{title.replace('&', '&amp;')}</a></h2>
+      <p class="aditem-main--middle--description">Verkaufe {title} in gutem Zustand. Nichtraucherhaushalt, keine Tiere. <!-- description --> Abholung oder Versand nach Absprache.</p>
+      <div class="aditem-main--middle--price-shipping">{price_html}</div>
+    </div>
+    <div class="aditem-main--bottom">
+      <p class="text-module-end">{tags}</p>
+      {pro_html}
+    </div>
+  </div>
+</article>
+</li>'''
+
+def chrome(rnd, body):
+    """Wrap results in the page chrome that makes up most of a real page"""
+    categories = ''.join(
+        f'<li><a href="/s-kategorie-{i}/c{i}" data-gaevent="category">Kategorie {i} <span class="text-light">({rnd.randint(100, 99999)})</span></a></li>'
+        for i in range(1, 320)
+    )
+    tracking = ','.join(f'"k{i}":"{rnd.getrandbits(64):x}"' for i in range(900))
+    style = ''.join(f'.c{i}{{margin:{i % 9}px;padding:{i % 5}px}}' for i in range(600))
+    return (
+        '<!DOCTYPE html><html lang="de"><head><meta charset="utf-8"><title>Kleinanzeigen</title>'
+        f'<style>{style}</style>'
+        f'<script>window.BelenConf = {{{tracking}}}; var tpl = "<article class=\'aditem\' data-adid=\'1\'>";</script>'
+        '</head><body><header class="site-header"><nav><ul class="browsebox-categories">'
+        f'{categories}</ul></nav></header><div id="site-content"><div id="srchrslt-content">{body}</div></div>'
+        '<footer class="site-footer">'
+        '<p>Copyright 2009-2026 kleinanzeigen.de</p></footer></body></html>'
+    )
+
+def results_page(seed, count, topads=3, pro_share=0.2, price_share=0.9, next_page=2):
+    """A result list with top ads first, then listings newest first"""
+    rnd = random.Random(seed)
+    first_id = 3000000000 + seed * 10000
+    parts = [article(rnd, 2900000000 + rnd.randrange(10 ** 7), topad=True, pro=rnd.random() < 0.5, price=rnd.random() < price_share)
+             for _ in range(topads)]
+    parts += [article(rnd, first_id - i * rnd.randint(1, 40), pro=rnd.random() < pro_share, price=rnd.random() < price_share)
+              for i in range(count)]
+    pagination = (f'<div class="pagination"><a class="pagination-page" href="/s-kategorie/seite:{next_page}/c88">{next_page}</a>'
+                  f'<a class="pagination-next" href="/s-kategorie/seite:{next_page}/c88" title="Nächste"></a></div>' if next_page else '')
+    return chrome(rnd, '<ul id="srchrslt-adtable" class="itemlist">' + ''.join(parts) + '</ul>' + pagination)
+
+def empty_page(seed):
+    """A search without results"""
+    rnd = random.Random(seed)
+    return chrome(rnd, '<div class="outcomemessage-warning"><h2>Es wurden leider keine Ergebnisse gefunden.</h2></div>'
+                       '<ul id="srchrslt-adtable" class="itemlist"></ul>')
+
+# Corpus: name -> page HTML
+CORPUS = {
+    'standard': lambda: results_page(1, 25),
+    'standard-page-2': lambda: results_page(2, 25, topads=0, next_page=3),
+    'no-prices': lambda: results_page(3, 25, price_share=0.0),
+    'many-topads': lambda: results_page(4, 25, topads=12),
+    'pro-sellers': lambda: results_page(5, 25, pro_share=0.9),
+    'last-page': lambda: results_page(6, 9, topads=1, next_page=None),
+    'empty': lambda: empty_page(7)
+}
+
+if __name__ == '__main__':
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    for name, build in CORPUS.items():
+        html = build().encode('utf-8')
+        path = os.path.join(FIXTURES_DIR, f'{name}.html.gz')
+        # mtime=0 keeps the files byte-identical between runs
+        with open(path, 'wb') as raw, gzip.GzipFile(filename='', fileobj=raw, mode='wb', mtime=0) as f:
+            f.write(html)
+        print(f'{name}: {len(html)} bytes -> {os.path.getsize(path)} bytes gzipped')
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Response capture for the Kleinanzeigen Scraper API - record and replay
+
+Record mode stores every response from kleinanzeigen.de in a directory, replay
+mode serves them back without any network access (load tests, offline
+debugging). The same directory is served by tools/standin_server.py.
+
+Layout (content-addressed - identical pages are stored once):
+    <dir>/index.jsonl                 one line per recorded response
+    <dir>/objects/ab/abcdef....gz     gzipped response body, named by its SHA-256
+
+Index entries:
+    {"key": "/s-autos/c216", "status": 200, "headers": {...},
+     "body": "<sha256>", "recordedAt": "2026-01-04T15:30:00Z"}
+
+Responses are keyed by path and query only, so a corpus recorded against
+kleinanzeigen.de replays for any SCRAPER_BASE_URL. A key recorded several
+times replays its responses in recording order, then starts over.
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import threading
+from datetime import datetime
+from urllib.parse import urlsplit
+
+import requests
+
+# Response headers kept in the index (everything else is transport detail)
+KEPT_HEADERS = ('Content-Type', 'Retry-After', 'ETag', 'Last-Modified')
+
+class NotRecordedError(requests.RequestException):
+    """Replay mode: no response recorded for this URL"""
+
+def capture_key(url):
+    """Return the index key for a URL - path and query, independent of the host"""
+    parts = urlsplit(url)
+    return parts.path + (f'?{parts.query}' if parts.query else '')
+
+class ResponseStore:
+    """
+    Content-addressed store of raw responses
+    
+    Args:
+        directory: Capture directory (created when recording)
+    """
+    
+    def __init__(self, directory):
+        self.directory = directory
+        self.index_file = os.path.join(directory, 'index.jsonl')
+        self._lock = threading.Lock()
+        self._entries = {}  # key -> [index entry]
+        self._positions = {}  # key -> next entry to replay
+        self.load()
+    
+    def load(self):
+        """(Re)read the index - later recordings of a key are replayed after earlier ones"""
+        entries = {}
+        if os.path.exists(self.index_file):
+            with open(self.index_file, encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        entries.setdefault(entry['key'], []).append(entry)
+        with self._lock:
+            self._entries = entries
+            self._positions = {}
+    
+    def keys(self):
+        """Return all recorded keys"""
+        with self._lock:
+            return list(self._entries)
+    
+    def __len__(self):
+        with self._lock:
+            return sum(len(entries) for entries in self._entries.values())
+    
+    def _object_path(self, digest):
+        return os.path.join(self.directory, 'objects', digest[:2], f'{digest}.gz')
+    
+    def put(self, key, status, headers, body):
+        """
+        Store one response
+        
+        Args:
+            key: Index key (see capture_key)
+            status: HTTP status code
+            headers: Response headers (only KEPT_HEADERS are stored)
+            body: Raw (decompressed) body bytes
+        
+        Returns:
+            The index entry
+        """
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write under a temporary name - concurrent readers never see partial objects
+            temp_path = f'{path}.{threading.get_ident()}.tmp'
+            with open(temp_path, 'wb') as raw, gzip.GzipFile(filename='', fileobj=raw, mode='wb', mtime=0) as f:
+                f.write(body)
+            os.replace(temp_path, path)
+        
+        entry = {
+            'key': key,
+            'status': status,
+            'headers': {name: headers[name] for name in KEPT_HEADERS if name in headers},
+            'body': digest,
+            'recordedAt': datetime.utcnow().isoformat() + 'Z'
+        }
+        with self._lock:
+            with open(self.index_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self._entries.setdefault(key, []).append(entry)
+        return entry
+    
+    def body(self, entry):
+        """Return the raw body bytes of an index entry"""
+        with gzip.open(self._object_path(entry['body']), 'rb') as f:
+            return f.read()
+    
+    def next_entry(self, key):
+        """
+        Return the next index entry to replay for a key (round-robin)
+        
+        Raises:
+            NotRecordedError: Nothing recorded for this key
+        """
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                raise NotRecordedError(f'No recorded response for {key}')
+            position = self._positions.get(key, 0)
+            self._positions[key] = (position + 1) % len(entries)
+            return entries[position]
+    
+    def record(self, url, response):
+        """
+        Store a live requests.Response
+        
+        Reads the whole body of successful responses (a streamed response is
+        still iterable afterwards); error bodies are recorded empty.
+        """
+        body = response.content if response.status_code < 400 else b''
+        return self.put(capture_key(url), response.status_code, response.headers, body)
+    
+    def replay(self, url):
+        """
+        Return the next recorded response for a URL as a requests.Response
+        
+        Works for buffered and streamed reads (the body is served from memory).
+        
+        Raises:
+            NotRecordedError: Nothing recorded for this URL
+        """
+        entry = self.next_entry(capture_key(url))
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.url = url
+        response.headers.update(entry['headers'])
+        response.raw = io.BytesIO(self.body(entry))
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.reason = 'Replayed'
+        return response
@@ -0,0 +1,608 @@
+#!/usr/bin/env python3
+"""
+Listing extraction for kleinanzeigen.de search result pages
+Turns search page HTML into listing dictionaries (15 fields each)
+
+Two interchangeable backends produce identical output:
+- lxml: selectors compiled once, each article walked a single time (default)
+- bs4:  BeautifulSoup CSS selectors (reference implementation / fallback)
+
+Compare both backends on a saved page:
+    python extraction.py page.html
+"""
+
+import hashlib
+import os
+import re
+import sys
+import time
+from dataclasses import dataclass, field, fields
+from html import unescape
+from bs4 import BeautifulSoup
+from lxml import etree
+
+BASE_URL = 'https://www.kleinanzeigen.de'
+
+# Start of the result list in the raw page (see page_fingerprint)
+RESULTS_MARKER = b'id="srchrslt-adtable"'
+
+# Pattern matches: "80809 Milbertshofen - Am Hart" or "81479 Thalk.Obersendl.-Forsten-Fürstenr.-Solln"
+LOCATION_PATTERN = re.compile(r'(\d{5}\s+[\w\s\-\.äöüÄÖÜß]+?)(?:\s+\d{5}|<|$)')
+
+# Tags already captured in dedicated fields (skipped in additional_info)
+DEDICATED_TAGS = ('Versand möglich', 'Nur Abholung', 'Direkt kaufen')
+
+# ============================================================================
+# Shared Field Logic
+# ============================================================================
+
+@dataclass(slots=True)
+class Listing:
+    """
+    One search result listing - the 15 fields returned by the API
+    
+    A slotted record instead of a dictionary: no per-listing key table, and the
+    numeric ID is parsed once (id_number) for sorting and since filters. Item
+    access (listing['title']) works like on the dictionaries it replaces.
+    orjson serializes it natively - fields starting with an underscore are
+    skipped (see serialization.py).
+    """
+    
+    # Core fields (always present)
+    id: str
+    url: str
+    title: str = None
+    location: str = None
+    image: str = None
+    seller_type: str = 'PRIVATE'
+    
+    # Optional fields
+    price: str = None
+    image_count: int = None
+    description: str = None
+    posted_date: str = None
+    shipping: str = None
+    seller_name: str = None
+    buy_now: bool = False
+    is_featured: bool = False
+    additional_info: list = field(default_factory=list)
+    
+    _id_number: int = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._id_number = listing_id_number(self.id)
+    
+    @property
+    def id_number(self):
+        """Listing ID as int (None if it isn't numeric)"""
+        return self._id_number
+    
+    def __getitem__(self, name):
+        return getattr(self, name)
+    
+    def __setitem__(self, name, value):
+        setattr(self, name, value)
+    
+    def get(self, name, default=None):
+        return getattr(self, name, default)
+    
+    def to_dict(self):
+        """Return the 15 fields as a dictionary (stdlib JSON, SQLite result cache)"""
+        return {name: getattr(self, name) for name in LISTING_FIELDS}
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a listing from to_dict() output"""
+        return cls(**{name: data[name] for name in LISTING_FIELDS if name in data})
+
+# Serialized fields in output order (also the order of compact records, see parse_page)
+LISTING_FIELDS = tuple(f.name for f in fields(Listing) if f.init)
+
+def new_listing(listing_id, data_href, is_pro):
+    """Return a listing with all 15 fields set to their defaults"""
+    return Listing(listing_id, BASE_URL + data_href, seller_type='PRO' if is_pro else 'PRIVATE')
+
+def sort_newest_first(listings):
+    """Sort listings in place by numeric ID, highest (newest) first"""
+    listings.sort(key=lambda listing: listing.id_number, reverse=True)
+
+def parse_location(full_text):
+    """Extract postal code + district name from the location element's text"""
+    # Decode HTML entities like &#8203; (zero-width space)
+    full_text = unescape(full_text)
+    
+    # Remove zero-width space character (U+200B)
+    full_text = full_text.replace('\u200b', '')
+    
+    location_match = LOCATION_PATTERN.search(full_text)
+    if location_match:
+        return location_match.group(1).strip()
+    
+    # Fallback: extract everything before first HTML tag or take first 100 chars
+    clean_text = full_text.split('<')[0].strip()
+    return clean_text[:100] if clean_text else None
+
+def parse_image_count(text):
+    """Return the gallery counter as int (None if not a number)"""
+    try:
+        return int(text)
+    except ValueError:
+        return None
+
+def parse_shipping(article_text):
+    """Return shipping info found anywhere in the article text"""
+    if 'Versand möglich' in article_text:
+        return 'Versand möglich'
+    elif 'Nur Abholung' in article_text:
+        return 'Nur Abholung'
+    return None
+
+def listing_id_number(listing_id):
+    """Return a listing ID as int (None if it isn't numeric)"""
+    try:
+        return int(listing_id)
+    except (TypeError, ValueError):
+        return None
+
+class Watermark:
+    """
+    Detects where a newest-first search page reaches already seen listings
+    
+    Reached at the non-featured since_id listing itself, or after `confirmations`
+    consecutive non-featured listings with a lower ID. Featured listings (top ads)
+    are pinned to the top regardless of age and never count, and a single lower
+    ID may just be an old listing that was bumped to the top.
+    """
+    
+    def __init__(self, since_id, confirmations=2):
+        self.since_id = since_id
+        self.since_number = listing_id_number(since_id)
+        self.confirmations = max(1, confirmations)
+        self._older_in_a_row = 0
+    
+    def reached(self, listing):
+        """Feed listings in page order - returns True once the watermark is reached"""
+        if not self.since_id or listing['is_featured']:
+            return False
+        if listing['id'] == self.since_id:
+            return True
+        
+        listing_number = listing.id_number
+        if self.since_number is not None and listing_number is not None and listing_number < self.since_number:
+            self._older_in_a_row += 1
+        else:
+            self._older_in_a_row = 0
+        return self._older_in_a_row >= self.confirmations
+    
+    def key(self):
+        """Identify the watermark and its progress - equal keys stop at the same listing of a page"""
+        return (self.since_id, self.confirmations, self._older_in_a_row)
+    
+    def sync(self, other):
+        """Adopt the progress of a copy that was fed listings elsewhere (parse worker process)"""
+        self._older_in_a_row = other._older_in_a_row
+
+def page_fingerprint(html):
+    """
+    Return a fingerprint of the results on a raw search page (None without articles)
+    
+    Hashes the bytes from the result list to the end of the last article, so
+    page chrome that changes between requests (tracking scripts, category
+    counts) doesn't change it. Two byte searches and one hash - no decoding or
+    parsing. Falls back to the start of the page if the result list marker is
+    missing.
+    """
+    end = html.rfind(b'</article>')
+    if end < 0:
+        return None
+    start = max(0, html.find(RESULTS_MARKER, 0, end))
+    return hashlib.sha256(html[start:end]).hexdigest()
+
+def is_featured(article_classes, parent_classes):
+    """Featured/promoted - check both article and parent <li> for promoted classes"""
+    return (
+        'is-highlight' in article_classes or
+        'is-topad' in article_classes or
+        'is-topad' in parent_classes or
+        'badge-topad' in parent_classes
+    )
+
+# ============================================================================
+# Backends
+# ============================================================================
+
+class ExtractionBackend:
+    """
+    Interface for extraction backends
+    
+    parse() builds a document from HTML - raw response bytes (decoded by the
+    parser itself, no str copy of the page) or str - articles() lists its article elements
+    in page order, article_id() reads an article's listing ID cheaply and
+    extract() builds the full listing dictionary.
+    """
+    
+    name = None
+    supports_streaming = False
+    
+    def parse(self, html, encoding=None):
+        """
+        Build a document from page HTML
+        
+        Args:
+            html: Raw page bytes or str
+            encoding: Charset of the bytes as declared by the server (None: detect from <meta>)
+        """
+        raise NotImplementedError
+    
+    def articles(self, document):
+        raise NotImplementedError
+    
+    def article_id(self, article):
+        return article.get('data-adid')
+    
+    def extract(self, article):
+        raise NotImplementedError
+    
+    def next_page(self, document):
+        """Return the href of the "next page" link (None on the last page)"""
+        raise NotImplementedError
+    
+    def stream(self, chunks, encoding=None):
+        """Return a StreamedPage parsing HTML chunks incrementally (streaming backends only)"""
+        raise NotImplementedError(f'{self.name} backend does not support streaming')
+    
+    def extract_all(self, html, since_id=None, encoding=None):
+        """Parse HTML and extract all listings (stopping at the since_id watermark)"""
+        listings = []
+        watermark = Watermark(since_id)
+        for article in self.articles(self.parse(html, encoding)):
+            listing = self.extract(article)
+            if watermark.reached(listing):
+                break
+            listings.append(listing)
+        return listings
+
+class BeautifulSoupBackend(ExtractionBackend):
+    """Reference backend: BeautifulSoup (lxml parser) with per-field CSS selectors"""
+    
+    name = 'bs4'
+    
+    def parse(self, html, encoding=None):
+        if isinstance(html, bytes):
+            return BeautifulSoup(html, 'lxml', from_encoding=encoding)
+        return BeautifulSoup(html, 'lxml')
+    
+    def articles(self, document):
+        return document.select('article.aditem')
+    
+    def next_page(self, document):
+        link = document.select_one('a.pagination-next')
+        return link.get('href') if link else None
+    
+    def extract(self, article):
+        listing = new_listing(
+            article.get('data-adid'),
+            article.get('data-href', ''),
+            article.select_one('.badge-hint-pro-small-srp')
+        )
+        
+        # Title
+        title_elem = article.select_one('a.ellipsis')
+        if title_elem:
+            listing['title'] = title_elem.get_text(strip=True)
+        
+        # Price
+        price_elem = article.select_one('.aditem-main--middle--price-shipping--price')
+        if price_elem:
+            listing['price'] = price_elem.get_text(strip=True)
+        
+        # Location - get raw text (icons will appear as text, but we'll filter them)
+        location_elem = article.select_one('.aditem-main--top--left')
+        if location_elem:
+            listing['location'] = parse_location(location_elem.get_text(separator=' ', strip=True))
+        
+        # Image
+        img_elem = article.select_one('img')
+        if img_elem and img_elem.get('src'):
+            listing['image'] = img_elem['src']
+        
+        # Image count
+        counter_elem = article.select_one('.galleryimage--counter')
+        if counter_elem:
+            listing['image_count'] = parse_image_count(counter_elem.get_text(strip=True))
+        
+        # Description
+        desc_elem = article.select_one('.aditem-main--middle--description')
+        if desc_elem:
+            listing['description'] = desc_elem.get_text(strip=True)
+        
+        # Posted date
+        date_elem = article.select_one('.aditem-main--top--right')
+        if date_elem:
+            listing['posted_date'] = date_elem.get_text(strip=True)
+        
+        # Shipping and buy now - check article text
+        article_text = article.get_text()
+        listing['shipping'] = parse_shipping(article_text)
+        listing['buy_now'] = 'Direkt kaufen' in article_text
+        
+        # Featured/promoted
+        parent_li = article.find_parent('li')
+        listing['is_featured'] = is_featured(
+            article.get('class', []),
+            parent_li.get('class', []) if parent_li else []
+        )
+        
+        # Additional info from bottom section (category-specific tags)
+        for tag in article.select('.aditem-main--bottom .simpletag'):
+            text = tag.get_text(strip=True)
+            if text not in DEDICATED_TAGS:
+                listing['additional_info'].append(text)
+        
+        return listing
+
+# Compiled once at import time
+_ARTICLES_XPATH = etree.XPath(
+    "//article[contains(concat(' ', normalize-space(@class), ' '), ' aditem ')]"
+)
+_NEXT_PAGE_XPATH = etree.XPath(
+    "//a[contains(concat(' ', normalize-space(@class), ' '), ' pagination-next ')]"
+)
+# Text nodes as BeautifulSoup's get_text() sees them (no comments, scripts, styles, templates)
+_TEXT_XPATH = etree.XPath(
+    'descendant-or-self::text()[not(ancestor::script or ancestor::style or ancestor::template)]',
+    smart_strings=False
+)
+
+# Single-element fields: class -> field (the title also requires an <a> tag)
+_FIRST_MATCH_CLASSES = {
+    'ellipsis': 'title',
+    'aditem-main--middle--price-shipping--price': 'price',
+    'aditem-main--top--left': 'location',
+    'galleryimage--counter': 'image_count',
+    'aditem-main--middle--description': 'description',
+    'aditem-main--top--right': 'posted_date',
+    'badge-hint-pro-small-srp': 'pro_badge',
+}
+
+def _text(element):
+    return ''.join(_TEXT_XPATH(element))
+
+def _stripped_text(element, separator=''):
+    return separator.join(s for s in (t.strip() for t in _TEXT_XPATH(element)) if s)
+
+def _classes(element):
+    value = element.get('class')
+    return value.split() if value else []
+
+class StreamedPage:
+    """
+    Incrementally parsed search page (lxml)
+    
+    Iterating feeds HTML chunks to lxml's pull parser and yields each article
+    as soon as its closing tag has been parsed - stop iterating to stop reading
+    chunks. next_page is set once the pagination link has been parsed. An
+    article is cleared once the consumer asks for the next one, so extract it
+    before advancing.
+    
+    Args:
+        chunks: Iterable of bytes (e.g. response.iter_content())
+        encoding: Charset declared by the server (None: detect from <meta>)
+    """
+    
+    def __init__(self, chunks, encoding=None):
+        self.chunks = chunks
+        self.encoding = encoding
+        self.next_page = None
+    
+    def _read(self, parser):
+        for _, element in parser.read_events():
+            classes = _classes(element)
+            if element.tag == 'article':
+                if 'aditem' in classes:
+                    yield element
+                    # Extracted by now - drop the subtree so a page never holds every parsed article
+                    element.clear(keep_tail=True)
+            elif 'pagination-next' in classes and self.next_page is None:
+                self.next_page = element.get('href')
+    
+    def __iter__(self):
+        parser = etree.HTMLPullParser(events=('end',), tag=('article', 'a'), encoding=self.encoding)
+        for chunk in self.chunks:
+            parser.feed(chunk)
+            yield from self._read(parser)
+        parser.close()
+        yield from self._read(parser)
+
+class LxmlBackend(ExtractionBackend):
+    """
+    Fast backend: native lxml tree, compiled XPath, one walk per article
+    
+    Output is identical to BeautifulSoupBackend - every field takes the first
+    matching descendant in document order, just like select_one().
+    """
+    
+    name = 'lxml'
+    supports_streaming = True
+    
+    def parse(self, html, encoding=None):
+        if not html:
+            return None
+        # Bytes are decoded by libxml2 while parsing - no Unicode copy of the page
+        parser = etree.HTMLParser(encoding=encoding if isinstance(html, bytes) else None)
+        return etree.fromstring(html, parser)
+    
+    def articles(self, document):
+        if document is None:
+            return []
+        return _ARTICLES_XPATH(document)
+    
+    def next_page(self, document):
+        if document is None:
+            return None
+        links = _NEXT_PAGE_XPATH(document)
+        return links[0].get('href') if links else None
+    
+    def stream(self, chunks, encoding=None):
+        return StreamedPage(chunks, encoding)
+    
+    def extract(self, article):
+        # One pass over all descendants, remembering the first match per field
+        found = {}
+        image_elem = None
+        tags = []
+        for element in article.iterdescendants():
+            tag = element.tag
+            if not isinstance(tag, str):
+                continue  # Comments and processing instructions
+            if tag == 'img' and image_elem is None:
+                image_elem = element
+            classes = element.get('class')
+            if not classes:
+                continue
+            for cls in classes.split():
+                field = _FIRST_MATCH_CLASSES.get(cls)
+                if field and field not in found and (field != 'title' or tag == 'a'):
+                    found[field] = element
+                elif cls == 'simpletag' and any(
+                    'aditem-main--bottom' in _classes(ancestor) for ancestor in element.iterancestors()
+                ) and element not in tags:
+                    tags.append(element)
+        
+        listing = new_listing(
+            article.get('data-adid'),
+            article.get('data-href', ''),
+            'pro_badge' in found
+        )
+        
+        if 'title' in found:
+            listing['title'] = _stripped_text(found['title'])
+        if 'price' in found:
+            listing['price'] = _stripped_text(found['price'])
+        if 'location' in found:
+            listing['location'] = parse_location(_stripped_text(found['location'], separator=' '))
+        if image_elem is not None and image_elem.get('src'):
+            listing['image'] = image_elem.get('src')
+        if 'image_count' in found:
+            listing['image_count'] = parse_image_count(_stripped_text(found['image_count']))
+        if 'description' in found:
+            listing['description'] = _stripped_text(found['description'])
+        if 'posted_date' in found:
+            listing['posted_date'] = _stripped_text(found['posted_date'])
+        
+        article_text = _text(article)
+        listing['shipping'] = parse_shipping(article_text)
+        listing['buy_now'] = 'Direkt kaufen' in article_text
+        
+        parent_li = next(article.iterancestors('li'), None)
+        listing['is_featured'] = is_featured(
+            _classes(article),
+            _classes(parent_li) if parent_li is not None else []
+        )
+        
+        for tag in tags:
+            text = _stripped_text(tag)
+            if text not in DEDICATED_TAGS:
+                listing['additional_info'].append(text)
+        
+        return listing
+
+BACKENDS = {
+    LxmlBackend.name: LxmlBackend(),
+    BeautifulSoupBackend.name: BeautifulSoupBackend(),
+}
+
+DEFAULT_BACKEND = LxmlBackend.name
+
+def get_backend(name=None):
+    """Return the extraction backend registered under name (default: lxml)"""
+    backend = BACKENDS.get(name or DEFAULT_BACKEND)
+    if backend is None:
+        raise ValueError(f'Unknown extraction backend: {name} (available: {", ".join(BACKENDS)})')
+    return backend
+
+# ============================================================================
+# Parse Workers
+# ============================================================================
+
+def listing_from_record(record):
+    """Rebuild a listing from a compact record (values in LISTING_FIELDS order)"""
+    return Listing(*record)
+
+def parse_page(html, encoding, backend_name, watermark):
+    """
+    Parse one search page and extract its listings up to the watermark
+    
+    Runs in parse worker processes: takes raw page bytes, returns listings as
+    compact records (tuples in LISTING_FIELDS order - no per-listing key strings
+    to pickle), see listing_from_record().
+    
+    Returns:
+        (records, next page href, watermark reached, articles seen, watermark
+        with its progress, parse seconds, extraction seconds)
+    """
+    backend = get_backend(backend_name)
+    parse_start = time.time()
+    document = backend.parse(html, encoding)
+    articles = backend.articles(document)
+    parse_duration = time.time() - parse_start
+    
+    records = []
+    reached = False
+    extract_start = time.time()
+    for article in articles:
+        listing = backend.extract(article)
+        if watermark.reached(listing):
+            reached = True
+            break
+        records.append(tuple(listing[field] for field in LISTING_FIELDS))
+    extract_duration = time.time() - extract_start
+    
+    return records, backend.next_page(document), reached, len(articles), watermark, parse_duration, extract_duration
+
+def warm_up(backend_name):
+    """Import and exercise a backend once (parse worker start-up) - returns the worker's PID"""
+    backend = get_backend(backend_name)
+    backend.extract_all(b'<ul><li><article class="aditem" data-adid="1" data-href="/"></article></li></ul>', encoding='utf-8')
+    return os.getpid()
+
+def compare_backends(html, since_id=None):
+    """
+    Extract the same HTML with every backend
+    
+    Returns:
+        List of (listing_id, field, {backend: value}) tuples for every difference
+    """
+    results = {name: backend.extract_all(html, since_id) for name, backend in BACKENDS.items()}
+    reference = results[BeautifulSoupBackend.name]
+    differences = []
+    
+    for name, listings in results.items():
+        if len(listings) != len(reference):
+            differences.append((None, 'count', {n: len(l) for n, l in results.items()}))
+            continue
+        for expected, actual in zip(reference, listings):
+            for field_name, value in expected.to_dict().items():
+                if actual.get(field_name) != value:
+                    differences.append((expected['id'], field_name, {n: l.get(field_name) for n, l in ((BeautifulSoupBackend.name, expected), (name, actual))}))
+    return differences
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print('Usage: python extraction.py <saved-search-page.html> [...]')
+        sys.exit(2)
+    
+    exit_code = 0
+    for html_file in sys.argv[1:]:
+        with open(html_file, 'rb') as f:
+            html = f.read()
+        differences = compare_backends(html)
+        count = len(get_backend().extract_all(html))
+        if differences:
+            exit_code = 1
+            print(f'✗ {html_file}: {len(differences)} difference(s) in {count} listings')
+            for listing_id, field, values in differences:
+                print(f'  {listing_id} {field}: {values}')
+        else:
+            print(f'✓ {html_file}: {count} listings identical across {", ".join(BACKENDS)}')
+    sys.exit(exit_code)
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Metrics for the Kleinanzeigen Scraper API
+
+Minimal thread-safe counters, gauges and histograms rendered in the Prometheus
+text exposition format (version 0.0.4) - no client library needed.
+
+Search URLs are free-form, so they are never used as label values. Metrics
+that are broken down per search use CategoryLabels, which reduces a URL to
+its kleinanzeigen.de category ID and caps the number of distinct values.
+"""
+
+import re
+import threading
+from bisect import bisect_left
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Category ID in the last path segment: /s-autos/c216, /s-berlin/tisch/k0c88l3331
+CATEGORY_PATTERN = re.compile(r'(?:^|k\d+)c(\d+)(?:l\d+)?(?:r\d+)?$')
+
+# Default histogram buckets (seconds)
+WAIT_BUCKETS = (0.1, 0.5, 1, 2, 3, 5, 10, 30, 60)
+FETCH_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 30)
+PARSE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+
+def _format_value(value):
+    """Format a sample value - integers without a trailing .0"""
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+def _escape(value):
+    """Escape a label value"""
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(labelnames, labelvalues, extra=None):
+    """Render {name="value",...} (empty string without labels)"""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, labelvalues)]
+    if extra:
+        pairs.append(f'{extra[0]}="{_escape(extra[1])}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+class _Metric:
+    """Base class - one metric family with a fixed set of label names"""
+    
+    type_name = None
+    
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+    
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f'{self.name} expects labels {self.labelnames}, got {tuple(labels)}')
+        return tuple(str(labels[name]) for name in self.labelnames)
+    
+    def render(self):
+        """Return the exposition lines of this metric family"""
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.type_name}']
+        with self._lock:
+            items = sorted(self._values.items())
+            lines.extend(self._render_samples(items))
+        return lines
+    
+    def _render_samples(self, items):
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}' for key, value in items]
+
+class Counter(_Metric):
+    """Monotonically increasing value"""
+    
+    type_name = 'counter'
+    
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+class Gauge(_Metric):
+    """Value read from a callback at render time"""
+    
+    type_name = 'gauge'
+    
+    def __init__(self, name, documentation, callback):
+        super().__init__(name, documentation)
+        self.callback = callback
+    
+    def render(self):
+        value = self.callback()
+        return [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} gauge',
+            f'{self.name} {_format_value(value if value is not None else 0)}'
+        ]
+
+class Histogram(_Metric):
+    """Observations counted into cumulative buckets, plus their sum and count"""
+    
+    type_name = 'histogram'
+    
+    def __init__(self, name, documentation, buckets, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+    
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket counts (last one is +Inf), sum
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+    
+    def _render_samples(self, items):
+        lines = []
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, key, ("le", _format_value(bound)))} {cumulative}')
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {_format_value(round(total, 6))}')
+            lines.append(f'{self.name}_count{labels} {cumulative}')
+        return lines
+
+class Registry:
+    """Collection of metric families, rendered in registration order"""
+    
+    def __init__(self):
+        self._metrics = []
+    
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+    
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+    
+    def gauge(self, name, documentation, callback):
+        return self.register(Gauge(name, documentation, callback))
+    
+    def histogram(self, name, documentation, buckets, labelnames=()):
+        return self.register(Histogram(name, documentation, buckets, labelnames))
+    
+    def render(self):
+        """Return the full exposition text"""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+class CategoryLabels:
+    """
+    Map search URLs to a bounded set of 'category' label values
+    
+    A URL becomes 'c<ID>' (its kleinanzeigen.de category) or 'none' if it has
+    no category. Once max_values distinct categories have been seen, further
+    ones are reported as 'other' so label cardinality stays bounded.
+    """
+    
+    def __init__(self, max_values):
+        self.max_values = max_values
+        self._lock = threading.Lock()
+        self._seen = set()
+    
+    def __call__(self, url):
+        path = url.split('?', 1)[0].split('#', 1)[0].rstrip('/')
+        match = CATEGORY_PATTERN.search(path.rsplit('/', 1)[-1])
+        if not match:
+            return 'none'
+        label = f'c{match.group(1)}'
+        with self._lock:
+            if label in self._seen:
+                return label
+            if len(self._seen) >= self.max_values:
+                return 'other'
+            self._seen.add(label)
+            return label
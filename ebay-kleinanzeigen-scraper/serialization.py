@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+JSON serialization for the Kleinanzeigen Scraper API
+
+Scrape responses are mostly listings - a multi-URL request returns hundreds of
+15-field records. ListingJSONProvider (installed as Flask's app.json) encodes
+them with orjson when it is installed: listings (extraction.Listing dataclasses)
+are serialized natively without building an intermediate dictionary, and
+non-ASCII text is written as UTF-8 instead of \\u escapes. Without orjson it
+falls back to Flask's stdlib encoder.
+
+Output is equivalent either way: dictionary keys are sorted like with Flask's
+default provider, listing fields keep their declared order (LISTING_FIELDS).
+
+Measure both encoders with:
+    python benchmarks/bench_serialize.py
+"""
+
+from flask.json.provider import DefaultJSONProvider
+
+import extraction
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    # Sorted keys like the stdlib provider; datetimes go through default() for the same format
+    ORJSON_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+def default(obj):
+    """Serialize types JSON has no representation for - listings as their 15 fields"""
+    if isinstance(obj, extraction.Listing):
+        return obj.to_dict()
+    return DefaultJSONProvider.default(obj)
+
+class ListingJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider - orjson if installed, the stdlib encoder otherwise"""
+    
+    default = staticmethod(default)
+    
+    @property
+    def encoder(self):
+        """Name of the encoder in use"""
+        return 'orjson' if orjson is not None else 'json'
+    
+    def dumps(self, obj, **kwargs):
+        # Formatting arguments (indent, separators) are stdlib-only
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS).decode('utf-8')
+    
+    def response(self, *args, **kwargs):
+        # Indented output (debug mode) stays with the stdlib encoder
+        if orjson is None or self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
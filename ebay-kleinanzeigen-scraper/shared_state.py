@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Cross-process state for the Kleinanzeigen Scraper API
+
+With more than one gunicorn worker every process would pace its own requests
+and run its own circuit breaker - N workers would send N times the configured
+rate to kleinanzeigen.de. SharedState keeps that state in a small SQLite file
+instead, so all workers on a host share one request budget, one breaker and
+one result cache.
+
+Every read-modify-write runs in a BEGIN IMMEDIATE transaction, which holds
+SQLite's write lock - updates from different processes are serialized the same
+way a threading.Lock serializes threads. Times stored here are wall-clock
+(time.time()), since time.monotonic() is not comparable between processes.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+class LocalState:
+    """
+    Process-local stand-in for SharedState (single gunicorn worker)
+    
+    Same locked() interface, backed by plain dicts - callers serialize access
+    with their own threading.Lock.
+    """
+    
+    clock = staticmethod(time.monotonic)
+    
+    def __init__(self):
+        self._documents = {}
+    
+    @contextmanager
+    def locked(self, key, default):
+        """Yield the state dict for key (created from default on first use)"""
+        state = self._documents.get(key)
+        if state is None:
+            state = self._documents[key] = dict(default)
+        yield state
+
+def _to_dict(obj):
+    """JSON fallback for records with a to_dict() method (extraction.Listing)"""
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    raise TypeError(f'{type(obj).__name__} is not JSON serializable')
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT NOT NULL)',
+    'CREATE TABLE IF NOT EXISTS result_cache (path TEXT PRIMARY KEY, result TEXT NOT NULL, since_id TEXT, created REAL NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS result_cache_created ON result_cache (created)'
+)
+
+class SharedState:
+    """
+    SQLite-backed state shared by all worker processes on a host
+    
+    Args:
+        path: Database file (created if missing) - must be on a local filesystem
+        timeout: Seconds to wait for another process's transaction
+    """
+    
+    # Wall-clock: comparable between processes
+    clock = staticmethod(time.time)
+    
+    def __init__(self, path, timeout=10.0):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self.transaction() as db:
+            for statement in SCHEMA:
+                db.execute(statement)
+    
+    def _connection(self):
+        """Return this thread's connection (SQLite connections can't be shared between threads)"""
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            # Autocommit mode - transactions are explicit (BEGIN IMMEDIATE)
+            db = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            self._local.db = db
+        return db
+    
+    @contextmanager
+    def transaction(self):
+        """Run statements under SQLite's write lock (serialized across processes)"""
+        db = self._connection()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            yield db
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+        db.execute('COMMIT')
+    
+    @contextmanager
+    def locked(self, key, default):
+        """
+        Lock, load and save one JSON state document
+        
+        Yields the stored dict (a copy of default if there is none yet) - changes
+        made to it are written back when the block exits without an exception.
+        """
+        with self.transaction() as db:
+            row = db.execute('SELECT value FROM state WHERE key = ?', (key,)).fetchone()
+            state = json.loads(row[0]) if row else dict(default)
+            yield state
+            db.execute('INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)', (key, json.dumps(state)))
+    
+    def cache_get(self, path, ttl):
+        """
+        Return (result, since_id, age seconds) of a cached scrape result, or None if missing or expired
+        """
+        row = self._connection().execute(
+            'SELECT result, since_id, created FROM result_cache WHERE path = ?', (path,)
+        ).fetchone()
+        if row is None:
+            return None
+        age = time.time() - row[2]
+        if age > ttl:
+            return None
+        return json.loads(row[0]), row[1], age
+    
+    def cache_put(self, path, result, since_id, ttl, max_entries):
+        """Store a scrape result, dropping expired entries and the oldest beyond max_entries"""
+        now = time.time()
+        with self.transaction() as db:
+            db.execute('INSERT OR REPLACE INTO result_cache (path, result, since_id, created) VALUES (?, ?, ?, ?)',
+                       (path, json.dumps(result, ensure_ascii=False, default=_to_dict), since_id, now))
+            db.execute('DELETE FROM result_cache WHERE created < ?', (now - ttl,))
+            db.execute('DELETE FROM result_cache WHERE path NOT IN (SELECT path FROM result_cache ORDER BY created DESC LIMIT ?)',
+                       (max_entries,))
+    
+    def cache_entries(self):
+        """Return the number of stored cache entries"""
+        return self._connection().execute('SELECT COUNT(*) FROM result_cache').fetchone()[0]
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for kleinanzeigen.de - load and failure testing without the real site
+
+Serves a capture directory recorded with SCRAPER_CAPTURE_MODE=record (see
+capture.py) and/or the benchmark fixture corpus, and injects the failures the
+scraper has to survive: latency, 429s (with Retry-After), 403 blocks and 5xx.
+
+Point the scraper at it with SCRAPER_BASE_URL:
+
+    python tools/standin_server.py --port 8080 --capture-dir captures --rate-429 0.05
+    SCRAPER_BASE_URL=http://localhost:8080 python server.py
+
+Paths that were not recorded are answered with a fixture page picked by a
+hash of the path (stable per search), or 404 with --no-fixtures.
+
+With --etags, pages carry an ETag and conditional requests for an unchanged
+page are answered with 304 Not Modified.
+
+Proxy-style requests (absolute URIs) are answered the same way, so several
+stand-ins can act as a local SCRAPER_PROXIES pool for plain-HTTP base URLs.
+"""
+
+import argparse
+import glob
+import gzip
+import hashlib
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRAPER_DIR = os.path.dirname(TOOLS_DIR)
+FIXTURES_DIR = os.path.join(SCRAPER_DIR, 'benchmarks', 'fixtures')
+sys.path.insert(0, SCRAPER_DIR)
+
+import capture
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """Answer GET requests from the corpus, with injected faults"""
+    
+    protocol_version = 'HTTP/1.1'
+    
+    def do_GET(self):
+        config = self.server.config
+        # Proxy-style absolute URIs are accepted too
+        parts = urlsplit(self.path)
+        key = parts.path + (f'?{parts.query}' if parts.query else '')
+        
+        delay = config.latency + random.uniform(0, config.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        
+        roll = random.random()
+        if roll < config.rate_429:
+            self.server.count('429')
+            return self._send(429, b'Too Many Requests', {'Retry-After': str(config.retry_after)})
+        roll -= config.rate_429
+        if roll < config.rate_403:
+            self.server.count('403')
+            return self._send(403, b'Forbidden')
+        roll -= config.rate_403
+        if roll < config.rate_5xx:
+            self.server.count('5xx')
+            return self._send(random.choice((500, 502, 503)), b'Server Error')
+        
+        if self.server.store is not None:
+            try:
+                entry = self.server.store.next_entry(key)
+            except capture.NotRecordedError:
+                pass
+            else:
+                self.server.count('recorded')
+                return self._send(entry['status'], self.server.store.body(entry), entry['headers'])
+        
+        if self.server.fixtures:
+            digest = hashlib.sha256(parts.path.encode('utf-8')).digest()
+            body = self.server.fixtures[int.from_bytes(digest[:4], 'big') % len(self.server.fixtures)]
+            self.server.count('fixture')
+            return self._send(200, body, {'Content-Type': 'text/html;charset=UTF-8'})
+        
+        self.server.count('404')
+        return self._send(404, b'Not Found')
+    
+    def _send(self, status, body, headers=None):
+        """Send a complete response - gzipped when the client accepts it, like the real site"""
+        headers = dict(headers or {})
+        headers.setdefault('Content-Type', 'text/plain; charset=utf-8')
+        if status == 200 and self.server.config.etags:
+            headers['ETag'] = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+            if self.headers.get('If-None-Match') == headers['ETag']:
+                self.server.count('304')
+                self.send_response(304)
+                self.send_header('ETag', headers['ETag'])
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+        if body and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body, compresslevel=1)
+            headers['Content-Encoding'] = 'gzip'
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        if self.server.config.verbose:
+            super().log_message(format, *args)
+
+class StandinServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the corpus and response counters"""
+    
+    daemon_threads = True
+    
+    def __init__(self, address, config):
+        super().__init__(address, StandinHandler)
+        self.config = config
+        self.store = capture.ResponseStore(config.capture_dir) if config.capture_dir else None
+        self.fixtures = [] if config.no_fixtures else load_fixtures()
+        self._lock = threading.Lock()
+        self.counts = {}
+    
+    def count(self, outcome):
+        with self._lock:
+            self.counts[outcome] = self.counts.get(outcome, 0) + 1
+
+def load_fixtures():
+    """Return the decompressed benchmark fixture pages"""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, '*.html.gz'))):
+        with gzip.open(path, 'rb') as f:
+            pages.append(f.read())
+    return pages
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Local stand-in for kleinanzeigen.de with fault injection')
+    arg_parser.add_argument('--host', default='127.0.0.1', help='Bind address (default: 127.0.0.1)')
+    arg_parser.add_argument('--port', type=int, default=8080, help='Port (default: 8080)')
+    arg_parser.add_argument('--capture-dir', help='Capture directory recorded with SCRAPER_CAPTURE_MODE=record')
+    arg_parser.add_argument('--no-fixtures', action='store_true', help='Answer unrecorded paths with 404 instead of a fixture page')
+    arg_parser.add_argument('--latency', type=float, default=0.0, help='Added latency per response in seconds')
+    arg_parser.add_argument('--jitter', type=float, default=0.0, help='Random extra latency up to this many seconds')
+    arg_parser.add_argument('--rate-429', type=float, default=0.0, help='Share of responses answered with 429 (0-1)')
+    arg_parser.add_argument('--rate-403', type=float, default=0.0, help='Share of responses answered with 403 (0-1)')
+    arg_parser.add_argument('--rate-5xx', type=float, default=0.0, help='Share of responses answered with 500/502/503 (0-1)')
+    arg_parser.add_argument('--retry-after', type=int, default=30, help='Retry-After seconds sent with 429s (default: 30)')
+    arg_parser.add_argument('--etags', action='store_true', help='Send ETags and answer matching If-None-Match with 304')
+    arg_parser.add_argument('--verbose', action='store_true', help='Log every request')
+    config = arg_parser.parse_args()
+    
+    if config.rate_429 + config.rate_403 + config.rate_5xx > 1:
+        arg_parser.error('fault rates add up to more than 1')
+    
+    server = StandinServer((config.host, config.port), config)
+    recorded = len(server.store) if server.store is not None else 0
+    print(f'Stand-in serving http://{config.host}:{config.port} - {recorded} recorded responses, {len(server.fixtures)} fixture pages')
+    print(f'Faults: 429 {config.rate_429:.0%}, 403 {config.rate_403:.0%}, 5xx {config.rate_5xx:.0%}, latency {config.latency}s +{config.jitter}s')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f'Responses: {server.counts}')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())